@@ -1,22 +1,21 @@
 import os
 import sys
-from openai import OpenAI
-import subprocess
+from http_client import openai_client
+from llm import complete
+from transcript_compress import compress
+from transcripts import open_subtitles
+from vtt import iter_captions, transcript_text
+
+TRANSCRIPT_TOKENS = 2000  # compressed transcript sent with the prompt
 
 def get_transcript(video_url):
     """Download YouTube transcript using yt-dlp"""
     try:
-        result = subprocess.run([
-            'yt-dlp', '--skip-download', '--write-subs', 
-            '--write-auto-subs', '--sub-langs', 'en',
-            '--sub-format', 'txt', '--output', '/tmp/transcript',
-            video_url
-        ], capture_output=True, text=True, timeout=60)
+        with open_subtitles(video_url, timeout=60, manual_subs=True) as f:
+            transcript = transcript_text(iter_captions(f)) if f else None
         
-        # Read the transcript file
-        if os.path.exists('/tmp/transcript.en.txt'):
-            with open('/tmp/transcript.en.txt', 'r') as f:
-                return f.read()
+        if transcript:
+            return transcript
         else:
             return "Transcript not available for this video."
     except Exception as e:
@@ -25,7 +24,7 @@ def get_transcript(video_url):
 def analyze_with_openai(transcript):
     """Send transcript to OpenAI for trading analysis"""
     api_key = open(os.path.expanduser('~/.config/trading-ai/.env')).read().split('=')[1].strip()
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
     
     prompt = f"""You are a trading assistant for a West Coast day trader. 
 Analyze this video transcript and extract:
@@ -37,16 +36,10 @@ Analyze this video transcript and extract:
 Format as a concise trading plan. If multiple stocks, list separately.
 
 Transcript:
-{transcript[:4000]}  # Limit to first 4000 chars
+{compress(transcript, TRANSCRIPT_TOKENS)}
 """
     
-    response = client.chat.completions.create(
-        model='gpt-4o-mini',
-        messages=[{'role': 'user', 'content': prompt}],
-        max_tokens=500
-    )
-    
-    return response.choices[0].message.content
+    return complete(client, prompt, max_tokens=500)
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
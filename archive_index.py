@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Archive manifest and incremental index pages for archive/YYYY-MM-DD/.
+
+archive/manifest.json lists every archived briefing (date, timestamp, path,
+tickers, biases, content hash), sorted by timestamp. Adding a briefing
+regenerates only the pages it appears on:
+
+    archive/index.html             months with counts, latest briefings
+    archive/YYYY-MM/index.html     one month's briefings
+    archive/tickers/TICKER.html    every briefing that mentions a ticker
+
+Lookups by date range bisect the sorted timestamps and per-ticker lookups use
+an in-memory index, so neither walks the archive or the GitHub API.
+
+Usage: python3 archive_index.py rebuild [SITE_DIR]
+       python3 archive_index.py find [--ticker T] [--from YYYY-MM-DD] [--to YYYY-MM-DD] [SITE_DIR]
+"""
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from html import escape
+
+from dashboard_templates import COMPACT_CSS, Template
+
+MANIFEST_PATH = 'archive/manifest.json'
+MANIFEST_VERSION = 1
+SITE_DIR = os.path.dirname(os.path.abspath(__file__))
+LATEST_COUNT = 30
+
+ARCHIVE_RE = re.compile(r'^archive/(\d{4}-\d{2}-\d{2})/briefing_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2})\.html$')
+CARD_RE = re.compile(r'<span class="ticker">([^<]+)</span><span class="badge \w+">([^<]*)</span>')
+
+PAGE = Template(
+    '<!DOCTYPE html><html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">'
+    '<title>{title}</title><style>{css}</style></head><body><div class="header"><h1>{title}</h1>'
+    '<div class="meta">{meta}</div></div><div class="container">{body}</div></body></html>',
+    css=COMPACT_CSS + '.row{display:flex;justify-content:space-between;gap:8px;padding:8px 0;border-bottom:1px solid var(--border)}'
+                      'a{color:var(--blue);text-decoration:none}.tags{color:var(--text2);font-size:13px;text-align:right}')
+SECTION = Template('<div class="section"><div class="section-title">{title}</div><div class="card">{rows}</div></div>')
+ROW = Template('<div class="row"><a href="{href}">{label}</a><span class="tags">{tags}</span></div>')
+
+
+def month_page(month):
+    return f'archive/{month}/index.html'
+
+
+def ticker_page(ticker):
+    return f'archive/tickers/{ticker}.html'
+
+
+def _label(ts):
+    """'2026-02-12_12-51' -> '2026-02-12 12:51'"""
+    date, time = ts.split('_')
+    return f"{date} {time.replace('-', ':')}"
+
+
+def _relative(page, path):
+    """Link from one site page to another"""
+    return os.path.relpath(path, os.path.dirname(page))
+
+
+class ArchiveManifest:
+    """All archived briefings, sorted by timestamp, with date and ticker lookups"""
+
+    def __init__(self, entries=()):
+        self.entries = sorted(entries, key=lambda e: e['ts'])
+        self._keys = [e['ts'] for e in self.entries]
+        self._by_path = {e['path']: e for e in self.entries}
+        self._by_ticker = defaultdict(list)
+        for e in self.entries:
+            for ticker in e['tickers']:
+                self._by_ticker[ticker].append(e)
+
+    @classmethod
+    def loads(cls, text):
+        return cls(json.loads(text)['entries'] if text else ())
+
+    @classmethod
+    def load(cls, site_dir=SITE_DIR):
+        try:
+            with open(os.path.join(site_dir, MANIFEST_PATH), encoding='utf-8') as f:
+                return cls.loads(f.read())
+        except FileNotFoundError:
+            return cls()
+
+    def dumps(self):
+        return json.dumps({'version': MANIFEST_VERSION, 'entries': self.entries},
+                          separators=(',', ':'), ensure_ascii=False)
+
+    def add(self, path, html, data=None):
+        """Record an archived page; returns the index pages it affects
+
+        data is the parse_analysis() dict for the briefing; without it the
+        tickers are read back from the page's cards.
+        """
+        m = ARCHIVE_RE.match(path)
+        if not m:
+            raise ValueError(f'not an archive path: {path}')
+        digest = hashlib.sha256(html.encode()).hexdigest()[:16]
+        old = self._by_path.get(path)
+        if old is not None and old['hash'] == digest:
+            return set()
+        if data is not None:
+            biases = {eq['ticker']: eq.get('bias') for eq in data.get('equities', [])}
+            biases.update((c['name'], c.get('bias')) for c in data.get('crypto', []))
+        else:
+            biases = dict(CARD_RE.findall(html))
+        entry = {'date': m.group(1), 'ts': m.group(2), 'path': path,
+                 'tickers': list(biases), 'biases': biases, 'hash': digest}
+        affected = self.pages_for(entry)
+        if old is not None:
+            affected |= self.pages_for(old)
+            self._remove(old)
+        i = bisect.bisect_right(self._keys, entry['ts'])
+        self._keys.insert(i, entry['ts'])
+        self.entries.insert(i, entry)
+        self._by_path[path] = entry
+        for ticker in entry['tickers']:
+            bisect.insort(self._by_ticker[ticker], entry, key=lambda e: e['ts'])
+        return affected
+
+    def _remove(self, entry):
+        i = self.entries.index(entry)
+        del self.entries[i], self._keys[i]
+        del self._by_path[entry['path']]
+        for ticker in entry['tickers']:
+            self._by_ticker[ticker].remove(entry)
+
+    def between(self, start=None, end=None):
+        """Entries dated start..end inclusive ('YYYY-MM-DD'), oldest first"""
+        lo = bisect.bisect_left(self._keys, start) if start else 0
+        hi = bisect.bisect_right(self._keys, end + '~') if end else len(self._keys)  # '~' sorts after '_HH-MM'
+        return self.entries[lo:hi]
+
+    def for_ticker(self, ticker, start=None, end=None):
+        entries = self._by_ticker.get(ticker.upper(), [])
+        return [e for e in entries if (not start or e['date'] >= start) and (not end or e['date'] <= end)]
+
+    def months(self):
+        """{'YYYY-MM': count}, newest first"""
+        counts = defaultdict(int)
+        for key in self._keys:
+            counts[key[:7]] += 1
+        return dict(sorted(counts.items(), reverse=True))
+
+    def tickers(self):
+        return sorted(t for t, entries in self._by_ticker.items() if entries)
+
+    @staticmethod
+    def pages_for(entry):
+        return {'archive/index.html', month_page(entry['date'][:7])} | {ticker_page(t) for t in entry['tickers']}
+
+    # --- rendering -------------------------------------------------------
+
+    def _rows(self, page, entries, ticker=None):
+        rows = []
+        for e in reversed(entries):
+            if ticker:
+                tags = escape(e['biases'].get(ticker) or '')
+            else:
+                tags = ' '.join(f'<a href="{_relative(page, ticker_page(t))}">{escape(t)}</a>' for t in e['tickers'])
+            rows.append(ROW.render(href=_relative(page, e['path']), label=_label(e['ts']), tags=tags))
+        return ''.join(rows) or ROW.render(href='#', label='No briefings', tags='')
+
+    def render_page(self, page):
+        if page == 'archive/index.html':
+            months = ''.join(ROW.render(href=_relative(page, month_page(m)), label=m, tags=f'{n} briefings')
+                             for m, n in self.months().items())
+            tickers = ' '.join(f'<a href="{_relative(page, ticker_page(t))}">{escape(t)}</a>' for t in self.tickers())
+            body = (SECTION.render(title='Latest', rows=self._rows(page, self.entries[-LATEST_COUNT:]))
+                    + SECTION.render(title='Months', rows=months or ROW.render(href='#', label='No briefings', tags=''))
+                    + SECTION.render(title='Tickers', rows=f'<div class="tags" style="text-align:left">{tickers}</div>'))
+            return PAGE.render(title='Briefing Archive', meta=f'{len(self.entries)} briefings', body=body)
+        if page.startswith('archive/tickers/'):
+            ticker = page[len('archive/tickers/'):-len('.html')]
+            entries = self.for_ticker(ticker)
+            return PAGE.render(title=escape(ticker), meta=f'{len(entries)} briefings',
+                               body=SECTION.render(title='Briefings', rows=self._rows(page, entries, ticker)))
+        month = page.split('/')[1]
+        entries = self.between(f'{month}-01', f'{month}-31')
+        return PAGE.render(title=month, meta=f'{len(entries)} briefings',
+                           body=SECTION.render(title='Briefings', rows=self._rows(page, entries)))
+
+    def build(self, pages):
+        """{page: html} for the given index pages"""
+        return {page: self.render_page(page) for page in sorted(pages)}
+
+    def build_all(self):
+        pages = {'archive/index.html'} | {month_page(m) for m in self.months()} | {ticker_page(t) for t in self.tickers()}
+        return self.build(pages)
+
+
+def scan(site_dir=SITE_DIR):
+    """Manifest rebuilt from the archived pages on disk"""
+    manifest = ArchiveManifest()
+    archive = os.path.join(site_dir, 'archive')
+    for day in sorted(os.listdir(archive)) if os.path.isdir(archive) else ():
+        day_dir = os.path.join(archive, day)
+        if not os.path.isdir(day_dir):
+            continue
+        for name in sorted(os.listdir(day_dir)):
+            path = f'archive/{day}/{name}'
+            if ARCHIVE_RE.match(path):
+                with open(os.path.join(day_dir, name), encoding='utf-8') as f:
+                    manifest.add(path, f.read())
+    return manifest
+
+
+def write_files(files, site_dir=SITE_DIR):
+    for path, content in files.items():
+        full = os.path.join(site_dir, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    opts = {}
+    for flag in ('--ticker', '--from', '--to'):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    if not args or args[0] not in ('rebuild', 'find'):
+        print(__doc__.strip().split('\n\n')[-1])
+        sys.exit(1)
+    site = args[1] if len(args) > 1 else SITE_DIR
+    if args[0] == 'rebuild':
+        manifest = scan(site)
+        write_files(dict(manifest.build_all(), **{MANIFEST_PATH: manifest.dumps()}), site)
+        print(f'{len(manifest.entries)} briefings, {len(manifest.months())} months, {len(manifest.tickers())} tickers')
+    else:
+        manifest = ArchiveManifest.load(site)
+        if '--ticker' in opts:
+            found = manifest.for_ticker(opts['--ticker'], opts.get('--from'), opts.get('--to'))
+        else:
+            found = manifest.between(opts.get('--from'), opts.get('--to'))
+        for e in found:
+            print(json.dumps(e))
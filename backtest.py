@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Score past setups against OHLC bars.
+
+For every setup with an entry and a stop or target, looks at the bars from
+the time it was recorded up to a horizon and finds, in bar order, the first
+touch of the entry, then whether the stop or the target was touched first.
+A bar that touches both counts as a stop.
+
+All setups are scored together: each setup's bar window is gathered into a
+row of a 2-D array (chunked to bound memory), and the touches are found with
+broadcast comparisons and argmax, so the cost scales with setups x horizon
+and not with the size of the price file.
+
+Prices are a CSV (or Parquet, with pandas) of ticker,time,open,high,low,close
+bars; time is unix seconds, a timestamp column or an ISO timestamp (UTC unless it
+carries an offset: Z, +05:30, -0400).
+Setups come from setup_store.
+
+Usage: python3 backtest.py PRICES [--days N] [--horizon-days D] [--store PATH]
+"""
+import csv
+import re
+import sys
+import time
+
+import numpy as np
+
+from setup_store import STORE_PATH, SetupStore, days_ago
+
+HORIZON_DAYS = 5
+CHUNK_CELLS = 1 << 22   # window cells per chunk (~32 MB per float64 array)
+NEVER = np.iinfo(np.int64).max
+
+OUTCOMES = ('no_entry', 'open', 'target', 'stop')
+
+
+class PriceData:
+    """Bars of all tickers in one set of arrays, sorted by (ticker, time)"""
+
+    def __init__(self, tickers, times, opens, highs, lows, closes):
+        names, codes = np.unique(np.asarray(tickers), return_inverse=True)
+        order = np.lexsort((times, codes))
+        self.tickers = {str(name): i for i, name in enumerate(names)}
+        self.codes = codes[order].astype(np.int64)
+        self.times = np.asarray(times, dtype=np.int64)[order]
+        self.open = np.asarray(opens, dtype=np.float64)[order]
+        self.high = np.asarray(highs, dtype=np.float64)[order]
+        self.low = np.asarray(lows, dtype=np.float64)[order]
+        self.close = np.asarray(closes, dtype=np.float64)[order]
+        # (ticker code, time) packed into one sortable key for vectorised searchsorted;
+        # a ticker's keys all sort below the next ticker's, so searches never cross tickers
+        self._keys = (self.codes << 34) + self.times
+
+    def __len__(self):
+        return len(self.times)
+
+    def locate(self, codes, times):
+        """Index of the first bar of each ticker at or after each time"""
+        return np.searchsorted(self._keys, (codes << 34) + times, side='left')
+
+
+# trailing UTC offset of an ISO timestamp with a time part: Z, +05:30, -0400
+OFFSET_RE = re.compile(r'[T ]\d\d:\d\d(?::\d\d(?:\.\d*)?)?(Z|[+-]\d\d:?\d\d)$')
+
+
+def _iso_seconds(text):
+    """Unix seconds of one ISO timestamp; naive ones are UTC"""
+    offset = 0
+    match = OFFSET_RE.search(text)
+    if match:
+        zone = match.group(1)
+        text = text[:match.start(1)]
+        if zone != 'Z':
+            digits = zone[1:].replace(':', '')
+            offset = (-1 if zone[0] == '-' else 1) * (int(digits[:2]) * 3600 + int(digits[2:]) * 60)
+    return int(np.datetime64(text, 's').astype(np.int64)) - offset
+
+
+def _to_seconds(values):
+    values = np.asarray(values)
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.int64)
+    if values.dtype.kind == 'M':  # Parquet / pandas timestamps
+        return values.astype('datetime64[s]').astype(np.int64)
+    try:
+        return values.astype(np.float64).astype(np.int64)
+    except (TypeError, ValueError):
+        values = np.char.strip(values.astype(str))
+        numeric = np.char.isdigit(values)
+        out = np.zeros(len(values), dtype=np.int64)
+        out[numeric] = values[numeric].astype(np.int64)
+        # bars share timestamps across tickers, so parse each distinct one once
+        stamps, inverse = np.unique(values[~numeric], return_inverse=True)
+        out[~numeric] = np.array([_iso_seconds(str(t)) for t in stamps], dtype=np.int64)[inverse]
+        return out
+
+
+def load_prices(path):
+    """PriceData from a CSV or Parquet file with ticker,time,open,high,low,close columns"""
+    if path.endswith('.parquet'):
+        import pandas as pd
+        df = pd.read_parquet(path)
+        columns = {c.lower(): df[c].to_numpy() for c in df.columns}
+    else:
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+        if pd is not None:
+            df = pd.read_csv(path)
+            columns = {c.lower(): df[c].to_numpy() for c in df.columns}
+        else:
+            with open(path, newline='') as f:
+                reader = csv.reader(f)
+                header = [h.strip().lower() for h in next(reader)]
+                data = list(zip(*reader))
+            columns = {h: np.array(col) for h, col in zip(header, data)}
+    time_col = next(c for c in ('time', 'timestamp', 'datetime', 'date') if c in columns)
+    return PriceData(columns['ticker'].astype(str), _to_seconds(columns[time_col]),
+                     columns['open'], columns['high'], columns['low'], columns['close'])
+
+
+def _first(hit):
+    """Column of the first True in each row, NEVER where there is none"""
+    idx = hit.argmax(axis=1).astype(np.int64)
+    idx[~hit[np.arange(len(hit)), idx]] = NEVER
+    return idx
+
+
+def score(setups, prices, horizon_days=HORIZON_DAYS):
+    """Outcome arrays for setups (dicts with ticker, recorded_at, entry, stop, target)
+
+    Returns a dict of equal-length arrays: outcome (index into OUTCOMES),
+    entry_bar/exit_bar (bars after recording, -1 when not reached), r
+    (result in units of risk; open trades marked to the last close in the
+    window, NaN without a stop).
+    """
+    n = len(setups)
+    codes = np.array([prices.tickers.get(s['ticker'], -1) for s in setups], dtype=np.int64)
+    t0 = np.array([s['recorded_at'] for s in setups], dtype=np.float64).astype(np.int64)
+    entry = np.array([s['entry'] for s in setups], dtype=np.float64)
+    stop = np.array([np.nan if s.get('stop') is None else s['stop'] for s in setups], dtype=np.float64)
+    target = np.array([np.nan if s.get('target') is None else s['target'] for s in setups], dtype=np.float64)
+    # long when the target is above the entry, or failing that the stop below it
+    long = np.where(np.isnan(target), stop < entry, target > entry)
+    direction = np.where(long, 1.0, -1.0)
+
+    known = codes >= 0
+    start = np.where(known, prices.locate(np.maximum(codes, 0), t0), 0)
+    end = np.where(known, prices.locate(np.maximum(codes, 0), t0 + int(horizon_days * 86400)), 0)
+    length = np.maximum(end - start, 0)
+
+    outcome = np.zeros(n, dtype=np.int8)
+    entry_bar = np.full(n, -1, dtype=np.int64)
+    exit_bar = np.full(n, -1, dtype=np.int64)
+    r = np.full(n, np.nan)
+
+    order = np.argsort(-length)  # longest first: each chunk's first window is its widest
+    i = 0
+    while i < n:
+        width = max(int(length[order[i]]), 1)
+        chunk = order[i:i + max(1, CHUNK_CELLS // width)]
+        i += len(chunk)
+
+        offsets = np.arange(width)
+        valid = offsets < length[chunk, None]
+        idx = np.minimum(start[chunk, None] + offsets, len(prices) - 1)
+        high = np.where(valid, prices.high[idx], -np.inf)
+        low = np.where(valid, prices.low[idx], np.inf)
+
+        e = entry[chunk, None]
+        entered = _first((low <= e) & (e <= high))
+        after = offsets >= np.minimum(entered, width)[:, None]
+        is_long = long[chunk, None]
+        s, t = stop[chunk, None], target[chunk, None]
+        stopped = _first(after & np.where(is_long, low <= s, high >= s))      # NaN compares False
+        reached = _first(after & np.where(is_long, high >= t, low <= t))
+
+        c_out = np.where(entered == NEVER, 0, np.where((stopped == NEVER) & (reached == NEVER), 1,
+                                                       np.where(stopped <= reached, 3, 2)))
+        outcome[chunk] = c_out
+        entry_bar[chunk] = np.where(entered == NEVER, -1, entered)
+        exit_at = np.minimum(stopped, reached)
+        exit_bar[chunk] = np.where(c_out >= 2, exit_at, -1)
+
+        risk = np.abs(entry[chunk] - stop[chunk])
+        last_close = prices.close[np.minimum(start[chunk] + np.maximum(length[chunk] - 1, 0), len(prices) - 1)]
+        exit_price = np.select([c_out == 2, c_out == 3, c_out == 1], [target[chunk], stop[chunk], last_close], np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r[chunk] = np.where(risk > 0, (exit_price - entry[chunk]) * direction[chunk] / risk, np.nan)
+    return {'outcome': outcome, 'entry_bar': entry_bar, 'exit_bar': exit_bar, 'r': r, 'priced': known & (length > 0)}
+
+
+def summarize(setups, results, key='source'):
+    """{group: stats} for setups that had price data, grouped by key"""
+    groups = np.array([s.get(key) or '?' for s in setups])
+    priced = results['priced']
+    out = {}
+    for group in sorted(set(groups[priced].tolist())):
+        mask = priced & (groups == group)
+        outcome = results['outcome'][mask]
+        counts = {name: int((outcome == code).sum()) for code, name in enumerate(OUTCOMES)}
+        closed = counts['target'] + counts['stop']
+        r = results['r'][mask & (results['outcome'] >= 1)]
+        r = r[~np.isnan(r)]
+        bars = results['exit_bar'][mask][outcome >= 2]
+        out[group] = dict(counts, setups=int(mask.sum()),
+                          triggered=int((outcome >= 1).sum()),
+                          hit_rate=round(counts['target'] / closed, 3) if closed else None,
+                          avg_r=round(float(r.mean()), 3) if len(r) else None,
+                          median_bars_to_exit=int(np.median(bars)) if len(bars) else None)
+    return out
+
+
+def tradeable(rows):
+    """Store rows that can be scored: an entry plus a stop or a target"""
+    return [r for r in rows if r['entry'] is not None and (r['stop'] is not None or r['target'] is not None)]
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    opts = {}
+    for flag in ('--days', '--horizon-days', '--store'):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    if not args:
+        print(__doc__.strip().split('\n\n')[-1])
+        sys.exit(1)
+    started = time.perf_counter()
+    prices = load_prices(args[0])
+    store = SetupStore(opts.get('--store', STORE_PATH))
+    since = days_ago(float(opts['--days'])) if '--days' in opts else None
+    setups = tradeable(store.query(since=since))
+    loaded = time.perf_counter()
+    results = score(setups, prices, float(opts.get('--horizon-days', HORIZON_DAYS)))
+    print(f'{len(prices):,} bars, {len(setups):,} setups; load {loaded - started:.2f}s, score {time.perf_counter() - loaded:.2f}s')
+    for source, stats in summarize(setups, results).items():
+        print(f'{source}: ' + ', '.join(f'{k}={v}' for k, v in stats.items()))
@@ -0,0 +1,114 @@
+"""Benchmark inputs: subtitle files of any length and canned LLM output.
+
+All fixtures are synthetic, not recordings. clip_10min.vtt is generated
+by make_vtt() from the templates below: market-update style speech in
+YouTube's auto-caption format (rolling two-line cues, inline word timings),
+so the parser sees the same structure and duplication as a real download.
+responses.json is hand-written analysis text in the shape the LLM returns
+for each source. Longer inputs, up to a four-hour live stream, are
+generated the same way, deterministically, and cached under the system
+temp dir, so the repository only carries the short clip. Run this module
+to regenerate the clip.
+"""
+import json
+import os
+import random
+import tempfile
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+GENERATED_DIR = os.path.join(tempfile.gettempdir(), 'trading-ai-bench')
+CLIP_MINUTES = 10
+SIZES = (10, 30, 60, 240)   # minutes: clip, show, long show, live stream
+
+WORDS_PER_SECOND = 2.6
+WORDS_PER_LINE = 8
+
+TICKERS = ['Bitcoin', 'Ethereum', 'Solana', 'NVDA', 'SPY', 'the S&P', 'the NASDAQ', 'Tesla', 'AMD', 'SMH']
+PATTERNS = ['bull flag', 'head and shoulders', 'double bottom', 'ascending triangle', 'breakout',
+            'breakdown', 'retest', 'wedge', 'golden pocket', 'fair value gap']
+FILLER = ['you know', 'um', 'so', 'like I said', 'basically', 'right', 'okay so', 'uh', 'let me just',
+          'and', 'I mean', 'honestly']
+TEMPLATES = [
+    '{filler} {ticker} is sitting right at {price} and that is the level I am watching',
+    'if we lose {price} on {ticker} I think we go down to {price2}',
+    '{ticker} entry around {price} stop below {price2} target {price3}',
+    'this {pattern} on {ticker} is setting up nicely {filler}',
+    'support at {price} resistance at {price2} on {ticker}',
+    '{filler} make sure you hit the like button and subscribe {filler}',
+    'we had a great week in the discord {filler} thanks everyone for joining',
+    '{ticker} rejected {price} twice now that is a {pattern} in my opinion',
+    '{filler} {filler} the macro picture has not really changed this week',
+    'I would not chase {ticker} here wait for the {pattern} to confirm above {price}',
+    'bulls need to reclaim {price} or this turns into a {pattern}',
+    'let us zoom out on the daily chart {filler}',
+]
+
+
+def _price(rng):
+    style = rng.random()
+    if style < 0.3:
+        return f'{rng.randint(60, 120)}K'
+    if style < 0.6:
+        return f'{rng.randint(2, 9)},{rng.randint(0, 999):03d}'
+    return f'{rng.randint(20, 900)}.{rng.randint(0, 99):02d}'
+
+
+def _sentences(rng):
+    while True:
+        yield rng.choice(TEMPLATES).format(
+            ticker=rng.choice(TICKERS), pattern=rng.choice(PATTERNS), filler=rng.choice(FILLER),
+            price=_price(rng), price2=_price(rng), price3=_price(rng))
+
+
+def _stamp(seconds):
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f'{int(h):02d}:{int(m):02d}:{s:06.3f}'
+
+
+def make_vtt(minutes, seed=0):
+    """YouTube-style auto-caption VTT of roughly `minutes` minutes"""
+    rng = random.Random(seed)
+    words = []
+    out = ['WEBVTT', 'Kind: captions', 'Language: en', '']
+    t, previous = 0.0, ''
+    sentences = _sentences(rng)
+    end = minutes * 60
+    while t < end:
+        while len(words) < WORDS_PER_LINE:
+            words += next(sentences).split()
+        line, words = words[:WORDS_PER_LINE], words[WORDS_PER_LINE:]
+        step = 1 / WORDS_PER_SECOND
+        tagged = line[0] + ''.join(f'<{_stamp(t + (i + 1) * step)}><c> {w}</c>' for i, w in enumerate(line[1:]))
+        t_next = t + len(line) * step
+        out += [f'{_stamp(t)} --> {_stamp(t_next)} align:start position:0%', previous or ' ', tagged, '']
+        text = ' '.join(line)
+        out += [f'{_stamp(t_next)} --> {_stamp(t_next + 0.01)} align:start position:0%', text, ' ', '']
+        previous, t = text, t_next + 0.01
+    return '\n'.join(out) + '\n'
+
+
+def vtt_path(minutes):
+    """Path of a subtitle fixture `minutes` long, generating it if needed"""
+    if minutes == CLIP_MINUTES:
+        return os.path.join(FIXTURES_DIR, 'clip_10min.vtt')
+    path = os.path.join(GENERATED_DIR, f'stream_{minutes}min.vtt')
+    if not os.path.exists(path):
+        os.makedirs(GENERATED_DIR, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(make_vtt(minutes, seed=minutes))
+        os.replace(tmp, path)
+    return path
+
+
+def responses():
+    """Canned LLM output: {'VI': analysis, 'MR': analysis, 'briefing': synthesized briefing}"""
+    with open(os.path.join(FIXTURES_DIR, 'responses.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    # regenerate the committed clip
+    with open(vtt_path(CLIP_MINUTES), 'w', encoding='utf-8') as f:
+        f.write(make_vtt(CLIP_MINUTES, seed=CLIP_MINUTES))
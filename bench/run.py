@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for the transcript -> dashboard path.
+
+Times each stage (parse, normalise, chunk, compress) on synthetic subtitle
+fixtures (see fixtures.py) from a 10-minute clip up to a 4-hour live stream,
+plus the parse and render stages on canned LLM output. No
+network, no API keys. Reports the best and median time per stage, input
+throughput, and peak traced memory (measured in a separate, untimed pass).
+
+Usage: python3 bench/run.py [--sizes 10,30,60,240] [--min-time 0.2]
+                            [--json FILE] [--baseline FILE] [--tolerance 0.25]
+
+--json appends this run's results as one JSON line; --baseline compares
+against the last line of such a file and exits 1 if any stage got slower
+than best * (1 + tolerance).
+"""
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import fixtures  # noqa: E402
+from combined_briefing import create_dashboard, parse_analysis  # noqa: E402
+from generate_dashboard import create_html, parse_briefing  # noqa: E402
+from mitch_ray_briefing import normalize_prices_in_transcript  # noqa: E402
+from transcript_compress import compress  # noqa: E402
+from transcript_index import TranscriptIndex  # noqa: E402
+from vtt import iter_captions, transcript_text  # noqa: E402
+
+MIN_TIME = 0.2       # seconds of repeats per stage
+MIN_REPEATS = 3
+
+
+def measure(fn, min_time=MIN_TIME):
+    """(best, median) seconds over enough repeats to fill min_time"""
+    times = []
+    started = time.perf_counter()
+    while len(times) < MIN_REPEATS or time.perf_counter() - started < min_time:
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times), statistics.median(times)
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def parse_vtt(path):
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        cues = list(iter_captions(f))
+    return cues, transcript_text(cues)
+
+
+def stages(sizes):
+    """(name, input_bytes, fn) for every benchmarked stage"""
+    out = []
+    for minutes in sizes:
+        path = fixtures.vtt_path(minutes)
+        size = os.path.getsize(path)
+        cues, text = parse_vtt(path)
+        out.append((f'vtt_parse/{minutes}m', size, lambda p=path: parse_vtt(p)))
+        out.append((f'normalize_prices/{minutes}m', len(text), lambda t=text: normalize_prices_in_transcript(t)))
+        out.append((f'chunking/{minutes}m', len(text), lambda c=cues: _chunk(c)))
+        out.append((f'compress/{minutes}m', len(text), lambda t=text: compress(t)))
+    canned = fixtures.responses()
+    analysis = f"VI: {canned['VI']}\n\nMR: {canned['MR']}"
+    briefing = canned['briefing']
+    structured = parse_analysis(analysis)
+    parsed = parse_briefing(briefing)
+    out += [
+        ('parse_analysis', len(analysis), lambda: parse_analysis(analysis)),
+        ('parse_briefing', len(briefing), lambda: parse_briefing(briefing)),
+        ('create_dashboard', len(analysis), lambda: create_dashboard(structured, analysis)),
+        ('create_html', len(briefing), lambda: create_html(parsed, briefing)),
+    ]
+    return out
+
+
+def _chunk(cues):
+    index = TranscriptIndex(cues, normalize=normalize_prices_in_transcript)
+    index.densest_windows(8000, 5)
+    return index.chunks(8000)
+
+
+def run(sizes, min_time=MIN_TIME):
+    results = {}
+    for name, size, fn in stages(sizes):
+        best, median = measure(fn, min_time)
+        results[name] = {'best': best, 'median': median, 'bytes': size,
+                         'mb_per_s': size / best / 1e6 if best else None, 'peak': peak_memory(fn)}
+    return results
+
+
+def report(results, baseline=None, tolerance=0.25):
+    """Printable table; second value is the list of regressed stages"""
+    lines = [f"{'stage':<24}{'best':>10}{'median':>10}{'input':>10}{'MB/s':>9}{'peak':>10}"]
+    regressed = []
+    for name, r in results.items():
+        flag = ''
+        old = (baseline or {}).get(name)
+        if old:
+            change = r['best'] / old['best'] - 1
+            flag = f'  {change:+.0%}'
+            if change > tolerance:
+                regressed.append(name)
+                flag += ' REGRESSION'
+        lines.append(f"{name:<24}{r['best'] * 1e3:>8.2f}ms{r['median'] * 1e3:>8.2f}ms"
+                     f"{r['bytes'] / 1024:>8.0f}KB{r['mb_per_s'] or 0:>9.1f}{r['peak'] / 1024:>8.0f}KB{flag}")
+    return '\n'.join(lines), regressed
+
+
+def last_record(path):
+    with open(path, encoding='utf-8') as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1])['results'] if lines else None
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    opts = {}
+    for flag in ('--sizes', '--min-time', '--json', '--baseline', '--tolerance'):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    sizes = [int(s) for s in opts['--sizes'].split(',')] if '--sizes' in opts else list(fixtures.SIZES)
+    results = run(sizes, float(opts.get('--min-time', MIN_TIME)))
+    baseline = last_record(opts['--baseline']) if '--baseline' in opts else None
+    table, regressed = report(results, baseline, float(opts.get('--tolerance', 0.25)))
+    print(table)
+    if '--json' in opts:
+        with open(opts['--json'], 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0],
+                                'results': results}) + '\n')
+    if regressed:
+        print(f"\n{len(regressed)} stage(s) slower than baseline: {', '.join(regressed)}")
+        sys.exit(1)
@@ -0,0 +1,260 @@
+"""Single-pass setup extraction for briefings and per-video analyses.
+
+Walks the text once, line by line, tracking the current section (equity,
+crypto, or other), the current source prefix (VI:/MR:) and the setup being
+built. Each line costs a fixed number of precompiled regex matches, so
+extraction stays linear in the briefing size whatever the number of tickers.
+
+Understands the markdown the synthesize prompt produces:
+
+    ### Equity Setups
+    1. **S&P 500 (SPX)**
+       - **Entry Level:** Near $7,000
+       - **Stop Level:** ~$6,950
+       - **Target Level:** $6,800
+
+as well as one-line forms like "NVDA - Entry $182 Stop $178 Target $190",
+"NVDA: $182, $178, $190" and "🎯 BTC SETUP ... Levels: Support $X / Resistance $Y".
+"""
+import re
+from dataclasses import dataclass, field
+
+CRYPTO_TICKERS = {
+    'BTC', 'ETH', 'SOL', 'XRP', 'DOGE', 'ADA', 'AVAX', 'LINK', 'DOT', 'BNB', 'LTC', 'MATIC',
+    'SHIB', 'TRX', 'TON', 'SUI', 'PEPE', 'ARB', 'OP', 'NEAR', 'ATOM', 'HBAR', 'XLM', 'BCH',
+}
+# Capitalised words that are not tickers
+NOT_TICKERS = {
+    'A', 'I', 'AM', 'PM', 'PT', 'ET', 'US', 'USD', 'ETF', 'THE', 'AND', 'FOR', 'KEY', 'RISK',
+    'SETUP', 'SETUPS', 'CRYPTO', 'EQUITY', 'MARKET', 'CHART', 'LEVELS', 'LEVEL', 'ALERTS', 'NOTE',
+    'RSI', 'MACD', 'EMA', 'SMA', 'VWAP', 'ATH', 'CPI', 'GDP', 'FOMC', 'FED', 'PRE', 'TA', 'H', 'OK',
+    'ENTRY', 'STOP', 'TARGET', 'BIAS', 'PLAN', 'TRADE', 'LONG', 'SHORT', 'BUY', 'SELL', 'VI', 'MR',
+}
+SOURCE_PREFIXES = ('VI', 'MR')
+
+OTHER_SECTION_WORDS = ('risk', 'checklist', 'summary', 'key level', 'context', 'takeaway', 'timeframe',
+                       'candlestick', 'indicator', 'chart pattern', 'execution', 'briefing for')
+CRYPTO_SECTION_WORDS = ('crypto', 'altcoin', 'bitcoin')
+EQUITY_SECTION_WORDS = ('equit', 'stock', 'setups', 'trade ideas')
+
+MARKERS_RE = re.compile(r'^[\s>*•\-–#]*(?:\d+[.)]\s*)?[^\w$(~]*')
+BOLD_RE = re.compile(r'\*\*|__')
+PAREN_TICKER_RE = re.compile(r'\(\$?([A-Z][A-Z0-9.]{0,5})\)')
+# A ticker only opens a setup when it leads an item: "NVDA - ...", "BTC: ...", "BTC SETUP", "LIT"
+LEAD_TICKER_RE = re.compile(r'^\$?([A-Z][A-Z0-9]{0,5})(?=\s*(?:[-–:|(]|$|SETUP\b))')
+FIELD_RE = re.compile(r'^(entry|stop|target|support|resistance|resist|focus area|range|zone|levels?)'
+                      r'\b[^:\n]{0,24}:', re.IGNORECASE)
+INLINE_LABEL_RE = re.compile(r'\b(entry|stop|target|support|resistance|resist)\b', re.IGNORECASE)
+PRICE_RE = re.compile(r'\$?~?\s?(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)(?:\s?([kK]))?\b(?!\s*%|:\d)')
+BULL_RE = re.compile(r'\b(bullish|long|buy|breakout|upside)\b', re.IGNORECASE)
+BEAR_RE = re.compile(r'\b(bearish|short|sell|breakdown|downside)\b', re.IGNORECASE)
+SOURCE_RE = re.compile(r'^(' + '|'.join(map(re.escape, SOURCE_PREFIXES)) + r'):\s*')
+
+LEVEL_FIELDS = ('entry', 'stop', 'target', 'support', 'resist')
+RANGE_LABELS = {'focus area', 'range', 'zone', 'levels', 'level'}
+
+
+@dataclass
+class Setup:
+    ticker: str
+    kind: str = 'equity'        # 'equity' or 'crypto'
+    entry: float = None
+    stop: float = None
+    target: float = None
+    support: float = None
+    resist: float = None
+    bias: str = 'Neutral'
+    source: str = None          # 'VI', 'MR', ... when the text carries a prefix
+    line: int = 0               # 0-based line where the setup starts
+    _bull: int = field(default=0, repr=False)
+    _bear: int = field(default=0, repr=False)
+
+    def levels(self):
+        return [v for v in (self.entry, self.stop, self.target, self.support, self.resist) if v is not None]
+
+    def has_trade(self):
+        return self.entry is not None and (self.stop is not None or self.target is not None)
+
+    def as_equity(self):
+        return {'ticker': self.ticker, 'entry': fmt_price(self.entry), 'stop': fmt_price(self.stop),
+                'target': fmt_price(self.target), 'bias': self.bias}
+
+    def as_crypto(self):
+        levels = self.levels()
+        support = self.support if self.support is not None else (min(levels) if len(levels) > 1 else None)
+        resist = self.resist if self.resist is not None else (max(levels) if len(levels) > 1 else None)
+        return {'name': self.ticker, 'support': fmt_price(support), 'resist': fmt_price(resist), 'bias': self.bias}
+
+
+def fmt_price(value):
+    if value is None:
+        return '—'
+    if value == int(value):
+        return f'${value:,.0f}'
+    return f'${value:,.2f}'
+
+
+def parse_price(match):
+    value = float(match.group(1).replace(',', ''))
+    return value * 1000 if match.group(2) else value
+
+
+def _prices(text, limit):
+    out = []
+    for m in PRICE_RE.finditer(text):
+        out.append(parse_price(m))
+        if len(out) == limit:
+            break
+    return out
+
+
+def _set(setup, name, value):
+    if name == 'resistance':
+        name = 'resist'
+    if getattr(setup, name) is None:
+        setattr(setup, name, value)
+
+
+def _scan_inline(setup, text):
+    """Apply 'entry $X ... stop $Y' style labels within one line; returns True if any matched"""
+    labels = list(INLINE_LABEL_RE.finditer(text))
+    for i, m in enumerate(labels):
+        end = labels[i + 1].start() if i + 1 < len(labels) else len(text)
+        found = _prices(text[m.end():end], 1)
+        if found:
+            _set(setup, m.group(1).lower(), found[0])
+    return bool(labels)
+
+
+def _apply_field(setup, label, value):
+    label = label.lower()
+    if label in RANGE_LABELS:
+        if not _scan_inline(setup, value):
+            found = _prices(value, 2)
+            if len(found) == 2:
+                _set(setup, 'support', min(found))
+                _set(setup, 'resist', max(found))
+        return
+    found = _prices(value, 1)
+    if found:
+        _set(setup, label, found[0])
+
+
+def _heading_ticker(text):
+    """(ticker, rest-of-line) if text opens a setup, else None"""
+    m = LEAD_TICKER_RE.match(text)
+    if m and m.group(1) not in NOT_TICKERS:
+        return m.group(1), text[m.end():]
+    if len(text.split()) <= 8:  # "S&P 500 (SPX)", "Semiconductor ETF (SMH)"
+        m = PAREN_TICKER_RE.search(text)
+        if m and m.group(1) not in NOT_TICKERS:
+            return m.group(1), text[m.end():]
+    return None
+
+
+def _is_title(text):
+    return len(text.split()) <= 6 and not text.endswith('.') and not PRICE_RE.search(text)
+
+
+def _count_bias(setup, text):
+    setup._bull += len(BULL_RE.findall(text))
+    setup._bear += len(BEAR_RE.findall(text))
+
+
+def _section_kind(lower, current):
+    if any(w in lower for w in CRYPTO_SECTION_WORDS):
+        return 'crypto'
+    if any(w in lower for w in OTHER_SECTION_WORDS):
+        return 'other'
+    if any(w in lower for w in EQUITY_SECTION_WORDS):
+        return 'equity'
+    return current
+
+
+def _finish(setup, out, index):
+    if setup is None:
+        return
+    if setup.entry is not None and setup.target is not None and setup.target != setup.entry:
+        setup.bias = 'Bullish' if setup.target > setup.entry else 'Bearish'
+    elif setup.entry is not None and setup.stop is not None and setup.stop != setup.entry:
+        setup.bias = 'Bullish' if setup.stop < setup.entry else 'Bearish'
+    elif setup._bull != setup._bear:
+        setup.bias = 'Bullish' if setup._bull > setup._bear else 'Bearish'
+    if not setup.levels():
+        return
+    key = (setup.ticker, setup.kind, setup.source)
+    if key in index:  # same ticker mentioned again: fill gaps in the first record
+        first = index[key]
+        for name in LEVEL_FIELDS:
+            _set(first, name, getattr(setup, name))
+        return
+    index[key] = setup
+    out.append(setup)
+
+
+def extract_setups(text, sources=SOURCE_PREFIXES):
+    """All setups in text, in order of first appearance"""
+    source_re = SOURCE_RE if sources == SOURCE_PREFIXES else re.compile(r'^(' + '|'.join(map(re.escape, sources)) + r'):\s*')
+    out, index = [], {}
+    section = None   # None until a heading says otherwise: kind comes from the ticker
+    source = None
+    current = None
+    for lineno, raw in enumerate(text.splitlines()):
+        line = raw.strip()
+        if not line:
+            continue
+        m = source_re.match(line)
+        if m:
+            _finish(current, out, index)
+            current, section, source = None, None, m.group(1)
+            line = line[m.end():]
+            if not line:
+                continue
+
+        is_header = line.startswith('#')
+        body = BOLD_RE.sub('', MARKERS_RE.sub('', line, count=1)).strip()
+        if not body:
+            continue
+        heading = _heading_ticker(body)
+
+        if current is not None and heading is None and not is_header:
+            field_match = FIELD_RE.match(body)
+            if field_match:
+                _apply_field(current, field_match.group(1), body[field_match.end():])
+                _count_bias(current, body)
+                continue
+
+        if heading is None and (is_header or _is_title(body)):
+            new_section = _section_kind(body.lower(), section)
+            if is_header or new_section != section:
+                _finish(current, out, index)
+                current, section = None, new_section
+                continue
+
+        if heading is not None and section != 'other':
+            _finish(current, out, index)
+            ticker, rest = heading
+            kind = 'crypto' if (section == 'crypto' or ticker in CRYPTO_TICKERS) else 'equity'
+            current = Setup(ticker, kind, source=source, line=lineno)
+            if not _scan_inline(current, rest):
+                found = _prices(rest, 3)
+                if kind == 'equity' and len(found) == 3:
+                    current.entry, current.stop, current.target = found
+                elif kind == 'crypto' and len(found) >= 2:
+                    current.support, current.resist = min(found[:2]), max(found[:2])
+            _count_bias(current, body)
+            continue
+
+        if current is not None:
+            _scan_inline(current, body)
+            _count_bias(current, body)
+    _finish(current, out, index)
+    return out
+
+
+def dashboard_data(setups):
+    """{'equities': [...], 'crypto': [...]} in the dict shape the renderers expect"""
+    return {
+        'equities': [s.as_equity() for s in setups if s.kind == 'equity' and s.has_trade()],
+        'crypto': [s.as_crypto() for s in setups if s.kind == 'crypto'],
+    }
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Incremental channel polling.
+
+Remembers which video IDs have already been handed downstream for each
+channel (~/trading-ai/seen_videos.json). A poll streams yt-dlp's flat
+playlist output newest-first and stops at the first known ID, so only new
+uploads are returned and the rest of the channel page is never parsed.
+
+Usage: python3 channel_watch.py [--interval SECONDS] [--once] CHANNEL_URL...
+Prints one JSON line per new upload.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import metrics
+import ytdlp_worker
+from paths import WORK_DIR
+
+STATE_PATH = os.path.join(WORK_DIR, 'seen_videos.json')
+SEEN_LIMIT = 200  # IDs remembered per channel
+POLL_INTERVAL = 300
+
+
+def video_record(data):
+    return {
+        'id': data['id'],
+        'title': data.get('title', ''),
+        'url': f"https://www.youtube.com/watch?v={data['id']}",
+        'upload_date': data.get('upload_date', ''),
+        'duration': data.get('duration') or 0,
+    }
+
+
+def iter_channel(channel_url, max_results=15, timeout=60, stop_at=()):
+    """Yield video records from a channel page, newest first, as yt-dlp emits them
+
+    Closing the generator early terminates yt-dlp. If the resident worker is
+    running it is asked instead, and stops server-side at any ID in stop_at.
+    The 'channel_list' span runs until the generator is exhausted or closed.
+    """
+    with metrics.span('channel_list', channel=channel_url) as span:
+        try:
+            entries = ytdlp_worker.call('playlist', timeout=timeout, url=channel_url,
+                                        max=max_results, stop_at=list(stop_at))
+        except (ytdlp_worker.WorkerUnavailable, ytdlp_worker.WorkerError):  # fall back to the CLI
+            pass
+        else:
+            span.set(videos=len(entries), worker=True)
+            for data in entries:
+                yield video_record(data)
+            return
+        proc = subprocess.Popen([
+            'yt-dlp', '--flat-playlist', '--dump-json',
+            '--playlist-end', str(max_results), channel_url
+        ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                if not line.strip():
+                    continue
+                span.add(bytes=len(line))
+                try:
+                    yield video_record(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+
+
+class ChannelState:
+    """Per-channel seen IDs and latest upload date, persisted as JSON"""
+
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.channels = json.load(f)
+        except (OSError, ValueError):
+            self.channels = {}
+
+    def seen(self, channel_url):
+        return set(self.channels.get(channel_url, {}).get('seen', []))
+
+    def mark_seen(self, channel_url, videos):
+        """Record videos (newest first) as processed and save"""
+        with self._lock:
+            entry = self.channels.setdefault(channel_url, {'seen': [], 'last_upload_date': ''})
+            new_ids = [v['id'] for v in videos if v['id'] not in entry['seen']]
+            entry['seen'] = (new_ids + entry['seen'])[:SEEN_LIMIT]
+            dates = [v.get('upload_date') or '' for v in videos] + [entry.get('last_upload_date', '')]
+            entry['last_upload_date'] = max(dates)
+            entry['checked_at'] = time.time()
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', prefix='.seen-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.channels, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+def new_videos(channel_url, state, max_results=15, timeout=60):
+    """Uploads not yet marked seen, newest first; stops reading at the first known ID"""
+    seen = state.seen(channel_url)
+    found = []
+    videos = iter_channel(channel_url, max_results, timeout, stop_at=seen)
+    try:
+        for video in videos:
+            if video['id'] in seen:
+                break
+            found.append(video)
+    finally:
+        videos.close()
+    return found
+
+
+def watch(channel_urls, on_new, interval=POLL_INTERVAL, state=None, once=False):
+    """Poll channels every `interval` seconds and call on_new(channel_url, video)
+
+    A video is marked seen only after on_new returns without raising, so a
+    failed run is retried on the next poll.
+    """
+    state = state or ChannelState()
+    while True:
+        for channel_url in channel_urls:
+            for video in reversed(new_videos(channel_url, state)):  # oldest first
+                try:
+                    on_new(channel_url, video)
+                except Exception as e:
+                    print(f"Error handling {video['url']}: {e}", file=sys.stderr)
+                    break
+                state.mark_seen(channel_url, [video])
+        if once:
+            return
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    once = '--once' in args
+    interval = POLL_INTERVAL
+    if '--interval' in args:
+        i = args.index('--interval')
+        interval = int(args[i + 1])
+        del args[i:i + 2]
+    channels = [a for a in args if not a.startswith('--')]
+    if not channels:
+        print(__doc__.strip().split('\n\n')[-1])
+        sys.exit(1)
+    watch(channels, lambda channel, video: print(json.dumps(dict(video, channel=channel)), flush=True),
+          interval=interval, once=once)
@@ -0,0 +1,97 @@
+"""Per-run stage outputs, so a failed run can be resumed instead of redone.
+
+Each run gets a directory ~/trading-ai/runs/<run_id>/ holding one JSON file
+per completed pipeline stage and, for per-item stages, one file per finished
+item (runs/<run_id>/<stage>/<index>.json). A pipeline given the checkpoint
+loads whatever is already there and only runs the rest, so resuming after a
+failed publish costs the publish, not the downloads and LLM calls before it.
+
+Values round-trip through JSON: tuples come back as lists.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+
+from paths import WORK_DIR
+
+RUNS_DIR = os.path.join(WORK_DIR, 'runs')
+RUNS_KEEP = 30
+
+
+class Checkpoint:
+    def __init__(self, run_id=None, root=RUNS_DIR):
+        # the pid keeps runs started in the same second apart; IDs still sort by start time
+        self.run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.root = root
+        self.dir = os.path.join(root, self.run_id)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def resume(cls, run_id=None, root=RUNS_DIR):
+        """Checkpoint of an earlier run; the most recent one if run_id is None"""
+        run_id = run_id or latest(root)
+        if not run_id or not os.path.isdir(os.path.join(root, run_id)):
+            raise FileNotFoundError(f'no run {run_id or "to resume"} in {root}')
+        return cls(run_id, root)
+
+    def _path(self, name, index=None):
+        if index is None:
+            return os.path.join(self.dir, f'{name}.json')
+        return os.path.join(self.dir, name, f'{index}.json')
+
+    def has(self, name, index=None):
+        return os.path.exists(self._path(name, index))
+
+    def load(self, name, index=None):
+        with open(self._path(name, index), encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, name, value, index=None):
+        """Store a stage (or item) output; returns False if it isn't JSON-serializable"""
+        try:
+            raw = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return False
+        path = self._path(name, index)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(raw)
+        os.replace(tmp, path)
+        return True
+
+    def discard(self, name, index=None):
+        """Forget a saved output, so the next run of the pipeline redoes it"""
+        try:
+            os.remove(self._path(name, index))
+        except FileNotFoundError:
+            pass
+
+    def completed(self):
+        """Names of the stages (not items) saved so far"""
+        try:
+            return sorted(name[:-5] for name in os.listdir(self.dir) if name.endswith('.json'))
+        except FileNotFoundError:
+            return []
+
+
+def runs(root=RUNS_DIR):
+    """Run IDs, oldest first"""
+    try:
+        return sorted(name for name in os.listdir(root) if os.path.isdir(os.path.join(root, name)))
+    except FileNotFoundError:
+        return []
+
+
+def latest(root=RUNS_DIR):
+    ids = runs(root)
+    return ids[-1] if ids else None
+
+
+def prune(keep=RUNS_KEEP, root=RUNS_DIR):
+    """Delete all but the newest `keep` runs"""
+    for run_id in runs(root)[:-keep]:
+        shutil.rmtree(os.path.join(root, run_id), ignore_errors=True)
@@ -1,8 +1,26 @@
 #!/usr/bin/env python3
-import os, subprocess, json, re, base64, requests
+import os, sys, json, base64
+from contextlib import closing
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from openai import OpenAI
+import http_client
+import checkpoint
+import metrics
+import scheduler
+import telegram_delivery
+from archive_index import MANIFEST_PATH, ArchiveManifest
+from briefing_parser import SOURCE_PREFIXES, dashboard_data, extract_setups
+from dashboard_templates import render_compact, render_shell
+from data_feed import append_history, build_feed, dumps, feed_files
+from llm import complete, completion_cache
+from pipeline import Pipeline, Stage, Stop
+from channel_watch import iter_channel
+from setup_store import setup_store
+from source_registry import matches, registry
+from transcript_compress import compress
+from transcripts import open_subtitles
+from vtt import iter_captions, transcript_text
 
 GITHUB_REPO = "Blocksparq-Lab/trading-dashboard"
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
@@ -10,50 +28,116 @@ HOME_DIR = Path.home()
 CONFIG_DIR = HOME_DIR / ".config" / "trading-ai"
 DASHBOARD_PATH = HOME_DIR / "trading-ai" / "dashboard.html"
 
-VERIFIED_INVESTING_URLS = [
-    "https://www.youtube.com/watch?v=0lmmV9Weyms",
-    "https://www.youtube.com/watch?v=QAs8cVeqdNs",
-]
-MITCH_RAY_URLS = ["https://www.youtube.com/watch?v=H3rtdD8lgN4"]
+MAX_WORKERS = 4        # videos in flight (yt-dlp + LLM) across all sources, override with MAX_WORKERS in .env
+SOURCE_TIMEOUT = 240   # seconds per step per video: channel listing, transcript fetch and analysis each
+                       # get this long (a video can take 2x), override with SOURCE_TIMEOUT
+TRANSCRIPT_TOKENS = 3000  # compressed transcript per analysis request, unless the profile says otherwise
+CHANNEL_SCAN = 15      # uploads looked at per channel when a source has no pinned videos
 
 class GitHubPublisher:
-    def __init__(self, repo, token):
+    """Publishes files to the Pages repo, all files of a run in one commit (Git Data API)"""
+    API = "https://api.github.com"
+    
+    def __init__(self, repo, token, branch=None):
         self.repo = repo
         self.token = token
+        self.branch = branch or os.environ.get("GITHUB_BRANCH")
         self.headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
     
-    def publish(self, html, text):
+    def publish(self, html, text, extra_files=None, index_html=None, data=None):
+        """Archive html and publish index_html (default: html) as the site's index.html
+        
+        The archive manifest is updated in the same commit, and only the
+        archive index pages this briefing appears on are rebuilt.
+        """
         ts = datetime.now().strftime("%Y-%m-%d_%H-%M")
         date = datetime.now().strftime("%Y-%m-%d")
-        self._upload("index.html", html, f"Update {ts}")
-        self._upload(f"archive/{date}/briefing_{ts}.html", html, f"Archive {ts}")
-        return f"https://{self.repo.split('/')[0]}.github.io/{self.repo.split('/')[1]}/"
-    
-    def _upload(self, path, content, msg):
-        url = f"https://api.github.com/repos/{self.repo}/contents/{path}"
-        r = requests.get(url, headers=self.headers)
-        data = {"message": msg, "content": base64.b64encode(content.encode()).decode()}
-        if r.status_code == 200:
-            data["sha"] = r.json()["sha"]
-        requests.put(url, headers=self.headers, json=data)
+        archive_path = f"archive/{date}/briefing_{ts}.html"
+        
+        def files():
+            # called per attempt: a retry rebuilds on the manifest another run just pushed
+            out = {"index.html": index_html or html, archive_path: html}
+            manifest = ArchiveManifest.loads(self.read_file(MANIFEST_PATH))
+            out.update(manifest.build(manifest.add(archive_path, html, data)))
+            out[MANIFEST_PATH] = manifest.dumps()
+            out.update(extra_files or {})
+            return out
+        self.publish_files(files, f"Update {ts}")
+        return self.site_url
+    
+    def published_on(self, date):
+        """Whether the site's archive manifest already lists a briefing dated date ('YYYY-MM-DD')
 
-def create_dashboard(data, briefing_text):
-    equities = data.get('equities', [])
-    crypto = data.get('crypto', [])
+        The manifest is committed together with index.html and the archive
+        page, so this reflects what actually reached GitHub.
+        """
+        return bool(ArchiveManifest.loads(self.read_file(MANIFEST_PATH)).between(date, date))
+    
+    def publish_data(self, feed, history=None):
+        """Intraday update: only data.json (and the day's NDJSON) change"""
+        self.publish_files(feed_files(feed, history), f"Data {feed['generated']}")
+        return self.site_url
+    
+    @property
+    def site_url(self):
+        owner, name = self.repo.split('/')
+        return f"https://{owner}.github.io/{name}/"
     
-    eq_html = ""
-    for eq in equities[:5]:
-        bias = "bull" if eq.get('bias') == 'Bullish' else "bear"
-        eq_html += f'<div class="card"><div class="ticker-row"><span class="ticker">{eq.get("ticker")}</span><span class="badge {bias}">{eq.get("bias")}</span></div><div class="grid"><div class="box"><div class="label">Entry</div><div class="price">{eq.get("entry")}</div></div><div class="box support"><div class="label">Stop</div><div class="price">{eq.get("stop")}</div></div><div class="box resist"><div class="label">Target</div><div class="price">{eq.get("target")}</div></div></div></div>'
+    def publish_files(self, files, msg, attempts=2):
+        """Write {path: str|bytes} as a single commit on the branch; returns the commit sha
+        
+        files may be a function returning the dict, called again for each
+        attempt, when the contents depend on what is on the branch.
+        """
+        branch = self.branch or self._api("GET", "")["default_branch"]
+        self.branch = branch
+        with metrics.span('publish') as span:
+            for attempt in range(attempts):
+                if attempt == 0 or callable(files):
+                    current = files() if callable(files) else files
+                    tree = self._tree(current)
+                if attempt == 0:
+                    span.set(files=len(current))
+                    span.add(bytes=sum(len(c) if isinstance(c, bytes) else len(c.encode()) for c in current.values()))
+                head = self._api("GET", f"git/ref/heads/{branch}")["object"]["sha"]
+                base_tree = self._api("GET", f"git/commits/{head}")["tree"]["sha"]
+                new_tree = self._api("POST", "git/trees", {"base_tree": base_tree, "tree": tree})
+                commit = self._api("POST", "git/commits", {"message": msg, "tree": new_tree["sha"], "parents": [head]})
+                r = http_client.request("PATCH", f"{self.API}/repos/{self.repo}/git/refs/heads/{branch}", headers=self.headers, json={"sha": commit["sha"]})
+                if r.status_code == 422 and attempt + 1 < attempts:
+                    span.add(retries=1)
+                    continue  # branch moved under us (not a fast-forward); rebuild on the new head
+                r.raise_for_status()
+                return commit["sha"]
     
-    crypto_html = ""
-    for c in crypto[:3]:
-        bias = "bull" if c.get('bias') == 'Bullish' else "bear"
-        crypto_html += f'<div class="card"><div class="ticker-row"><span class="ticker">{c.get("name")}</span><span class="badge {bias}">{c.get("bias")}</span></div><div class="grid two"><div class="box support"><div class="label">Support</div><div class="price">{c.get("support")}</div></div><div class="box resist"><div class="label">Resistance</div><div class="price">{c.get("resist")}</div></div></div></div>'
+    def _tree(self, files):
+        tree = []
+        for path, content in files.items():
+            if isinstance(content, bytes):
+                blob = self._api("POST", "git/blobs", {"content": base64.b64encode(content).decode(), "encoding": "base64"})
+                tree.append({"path": path, "mode": "100644", "type": "blob", "sha": blob["sha"]})
+            else:
+                tree.append({"path": path, "mode": "100644", "type": "blob", "content": content})
+        return tree
     
-    css = """:root{--bg:#0d1117;--bg2:#161b22;--bg3:#21262d;--border:#30363d;--text:#f0f6fc;--text2:#8b949e;--blue:#58a6ff;--green:#238636;--red:#da3633}*{margin:0;padding:0;box-sizing:border-box}body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:var(--bg);color:var(--text);line-height:1.6;padding-bottom:40px}.header{background:linear-gradient(135deg,var(--bg2) 0%,var(--bg3) 100%);padding:30px 20px;border-bottom:1px solid var(--border);position:sticky;top:0;z-index:100}.header h1{font-size:28px;font-weight:700;background:linear-gradient(90deg,var(--blue),#a371f7);-webkit-background-clip:text;-webkit-text-fill-color:transparent}.meta{color:var(--text2);font-size:14px}.container{padding:20px;max-width:600px;margin:0 auto}.section{margin-bottom:24px}.section-title{font-size:18px;font-weight:600;margin-bottom:16px;display:flex;align-items:center;gap:8px}.section-title::before{content:'';width:4px;height:20px;background:var(--blue);border-radius:2px}.card{background:var(--bg2);border:1px solid var(--border);border-radius:12px;padding:16px;margin-bottom:12px}.ticker-row{display:flex;justify-content:space-between;align-items:center;margin-bottom:12px}.ticker{font-size:24px;font-weight:700;color:var(--blue)}.badge{padding:4px 12px;border-radius:20px;font-size:12px;font-weight:600}.bull{background:rgba(35,134,54,.2);color:#3fb950}.bear{background:rgba(218,54,51,.2);color:#f85149}.grid{display:grid;grid-template-columns:repeat(3,1fr);gap:8px}.two{grid-template-columns:repeat(2,1fr)}.box{background:var(--bg3);padding:12px;border-radius:8px;text-align:center}.support{border:1px solid rgba(63,185,80,.3)}.resist{border:1px solid rgba(248,81,73,.3)}.label{font-size:11px;color:var(--text2);text-transform:uppercase;margin-bottom:4px}.price{font-size:16px;font-weight:700}.alert{background:linear-gradient(135deg,rgba(218,54,51,.2) 0%,rgba(182,35,36,.2) 100%);border:1px solid var(--red);border-radius:12px;padding:16px;margin-top:20px}.alert h3{color:#f85149;font-size:14px;margin-bottom:8px}"""
+    def read_file(self, path):
+        """Current contents of a file on the branch, or None if it doesn't exist"""
+        params = {"ref": self.branch} if self.branch else None
+        r = http_client.request("GET", f"{self.API}/repos/{self.repo}/contents/{path}", params=params,
+                                headers=dict(self.headers, Accept="application/vnd.github.raw"))
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.text
     
-    return f"""<!DOCTYPE html><html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>Trading Briefing</title><style>{css}</style></head><body><div class="header"><h1>Trading Briefing</h1><div class="meta">{datetime.now().strftime('%Y-%m-%d %H:%M PT')}</div></div><div class="container"><div class="section"><div class="section-title">Equity Setups</div>{eq_html or '<div style="text-align:center;padding:40px;color:var(--text2)">No setups</div>'}</div><div class="section"><div class="section-title">Crypto Levels</div>{crypto_html or '<div style="text-align:center;padding:40px;color:var(--text2)">No crypto data</div>'}</div><div class="alert"><h3>⚠️ Risk Management</h3><ul style="list-style:none;font-size:14px;color:var(--text2)"><li style="margin-bottom:4px">• Don't trade past 9:30 AM PT</li><li style="margin-bottom:4px">• Max 3% risk per trade</li><li>• Set stops immediately</li></ul></div></div></body></html>"""
+    def _api(self, method, path, payload=None):
+        url = f"{self.API}/repos/{self.repo}" + (f"/{path}" if path else "")
+        r = http_client.request(method, url, headers=self.headers, json=payload)
+        r.raise_for_status()
+        return r.json()
+
+def create_dashboard(data, briefing_text):
+    return render_compact(data)
 
 def send_telegram(token, chat, data, url):
     msg = f"📊 <b>Trading Briefing</b>\n<code>{datetime.now().strftime('%Y-%m-%d %H:%M PT')}</code>\n\n"
@@ -61,36 +145,227 @@ def send_telegram(token, chat, data, url):
         emoji = "🟢" if eq.get('bias') == 'Bullish' else "🔴"
         msg += f"{emoji} <b>{eq.get('ticker')}</b> | E:{eq.get('entry')} S:{eq.get('stop')} T:{eq.get('target')}\n"
     msg += f"\n🔗 <a href='{url}'>View Dashboard</a>"
-    requests.post(f"https://api.telegram.org/bot{token}/sendMessage", json={'chat_id':chat,'text':msg,'parse_mode':'HTML','reply_markup':json.dumps({'inline_keyboard':[[{'text':'📱 Open Dashboard','url':url}]]})})
-
-def get_transcript(url):
-    for f in ['/tmp/vid.en.vtt','/tmp/vid.vtt']: 
-        if os.path.exists(f): os.remove(f)
-    subprocess.run(['yt-dlp','--skip-download','--write-auto-subs','--sub-langs','en','--sub-format','vtt','--output','/tmp/vid',url], capture_output=True, timeout=120)
-    vtt = '/tmp/vid.en.vtt' if os.path.exists('/tmp/vid.en.vtt') else '/tmp/vid.vtt'
-    if not os.path.exists(vtt): return None
-    with open(vtt,'r',encoding='utf-8',errors='ignore') as f: content=f.read()
-    lines=[re.sub(r'<[^>]+>','',line.strip()) for line in content.split('\n') if line.strip() and '-->' not in line and not line.startswith('WEBVTT')]
-    return ' '.join(dict.fromkeys(lines))
-
-def analyze(transcript, api_key, type='trading'):
-    client = OpenAI(api_key=api_key)
-    prompt = "Extract trading setups. Tickers, entry, stop, target, patterns, confidence. Transcript: " if type=='trading' else "Extract crypto setups. BTC/ETH/altcoins, levels, patterns. Transcript: "
-    return client.chat.completions.create(model='gpt-4o-mini',messages=[{'role':'user','content':prompt+transcript[:6000]}],max_tokens=800).choices[0].message.content
-
-def parse_analysis(text):
-    data={'equities':[],'crypto':[],'market_context':text[:500]}
-    for line in text.split('\n'):
-        if re.match(r'^[A-Z]{2,5}\s*[-:]', line):
-            nums=re.findall(r'\0([\d,.]+)',line)
-            if len(nums)>=3:
-                data['equities'].append({'ticker':re.match(r'^([A-Z]{2,5})',line).group(1),'entry':f"",'stop':f"",'target':f"",'bias':'Bullish' if float(nums[2].replace(',',''))>float(nums[0].replace(',','')) else 'Bearish'})
-        if 'BTC' in line:
-            nums=re.findall(r'\0([\d,]+)',line)
-            if len(nums)>=2: data['crypto'].append({'name':'BTC','support':f"",'resist':f"",'bias':'Neutral'})
+    results = telegram_delivery.deliver(token, telegram_delivery.parse_chat_ids(chat), msg, parse_mode='HTML',
+                                        reply_markup=json.dumps({'inline_keyboard':[[{'text':'📱 Open Dashboard','url':url}]]}))
+    return delivered(results)
+
+def delivered(results):
+    """Report failed parts of a telegram_delivery.deliver() result; True if any chat got the whole message"""
+    ok = False
+    for chat, result in results.items():
+        for part, error in result['failed']:
+            print(f"  ⚠️ Telegram chat {chat} part {part + 1}: {error}")
+        ok = ok or not result['failed']
+    return ok
+
+def get_transcript(url, timeout=120, download=True):
+    with open_subtitles(url, download=download, timeout=timeout) as f:
+        if f is None: return None
+        with metrics.span('vtt_parse') as span:
+            text = transcript_text(iter_captions(f))
+            span.add(bytes=len(text))
+        return text or None
+
+def analyze(transcript, api_key, profile='trading', timeout=None):
+    """Analysis of one transcript with a sources.json prompt profile"""
+    client = http_client.openai_client(api_key)
+    profile = registry().profile(profile)
+    text = compress(transcript, profile.get('transcript_tokens', TRANSCRIPT_TOKENS))
+    return complete(client, profile['prompt'] + text, max_tokens=profile.get('max_tokens', 800), timeout=timeout)
+
+def find_videos(source, listing=True):
+    """Registry source -> [(label, url, profile)]: its pinned videos, or its newest matching uploads
+
+    With listing=False (the scheduler's cached plan) channels aren't listed,
+    so a source without pinned videos contributes nothing.
+    """
+    urls = list(source['videos'])
+    if not urls and not listing:
+        print(f"  {source['label']}: channel not listed (cached plan)")
+    elif not urls:
+        with closing(iter_channel(source['channel'], CHANNEL_SCAN)) as uploads:
+            for video in uploads:
+                if matches(source, video['title']):
+                    urls.append(video['url'])
+                    if len(urls) == source['latest']:
+                        break
+        print(f"  {source['label']}: {len(urls)} matching upload(s) on {source['channel']}")
+    return [(source['label'], url, source['profile']) for url in urls]
+
+def flatten_videos(videos):
+    return [video for found in videos for video in found]
+
+def fetch_source(source, timeout=SOURCE_TIMEOUT, download=True):
+    """(label, url, profile) -> (label, url, profile, transcript or None)"""
+    label, url, profile = source
+    return label, url, profile, get_transcript(url, timeout=timeout, download=download)
+
+def analyze_source(fetched, api_key, timeout=SOURCE_TIMEOUT):
+    """(label, url, profile, transcript) -> (label, url, analysis or None)
+
+    The transcript gets the source's normalize rules first (MR: 93k -> 93000).
+    """
+    label, url, profile, transcript = fetched
+    if transcript:
+        transcript = registry().normalize(label, transcript)
+    analysis = analyze(transcript, api_key, profile, timeout=timeout) if transcript else None
+    print(f"  {label} {url}: {len(transcript or ''):,} chars" + (" ✓ Analyzed" if analysis else " (no transcript)"))
+    return label, url, analysis
+
+def collect_results(analyzed):
+    results = [(label, url, analysis) for label, url, analysis in analyzed if analysis]
+    if not results:
+        raise Stop('no_analyses')
+    return results
+
+def parse_results(results, sources):
+    """(combined analysis text, parse_analysis data); marked "VI ONLY" etc. when a source is missing"""
+    combined = "\n\n".join(f"{label}: {analysis}" for label, _, analysis in results)
+    labels = {label for label, _, _ in results}
+    if len(labels) == 1 and len(sources) > 1:
+        combined = f"{labels.pop()} ONLY:\n\n{combined}"
+    return combined, parse_analysis(combined, tuple(s['label'] for s in sources))
+
+def record_setups(results):
+    recorded = sum(setup_store.record(extract_setups(text), source=label, video_url=url) for label, url, text in results)
+    print(f"  Recorded {recorded} setups in {setup_store.path}")
+    return recorded
+
+def make_feed(briefing, results):
+    """(feed, the day's NDJSON history)"""
+    feed = build_feed(briefing[1], sources=[{'label': label, 'url': url} for label, url, _ in results])
+    return feed, append_history(feed)
+
+def render_dashboard(briefing, feed):
+    """Dashboard html; the local copy inlines its data, file:// pages can't fetch data.json"""
+    combined, structured = briefing
+    feed, _ = feed
+    print("\n📊 Generating dashboard...")
+    html = create_dashboard(structured, combined)
+    DASHBOARD_PATH.write_text(render_shell(feed))
+    (DASHBOARD_PATH.parent / "data.json").write_text(dumps(feed))
+    print(f"  Saved: {DASHBOARD_PATH} (revision {feed['revision']})")
+    return html
+
+def publish_dashboard(html, briefing, feed, intraday=False):
+    """Full publish (shell, archive page, data); intraday, only data.json and the NDJSON
+
+    An intraday run still does a full publish unless the site already has
+    a briefing for the day, so every day gets its shell and archive page
+    even when the morning publish failed or ran elsewhere.
+    """
+    if not (GITHUB_TOKEN and GITHUB_REPO):
+        return None
+    publisher = GitHubPublisher(GITHUB_REPO, GITHUB_TOKEN)
+    feed, history = feed
+    if intraday and publisher.published_on(feed['date']):
+        print("\n🚀 Publishing data.json (intraday)...")
+        url = publisher.publish_data(feed, history)
+        print(f"  URL: {url} (revision {feed['revision']})")
+        return url
+    print("\n🚀 Publishing to GitHub Pages...")
+    combined, structured = briefing
+    url = publisher.publish(html, combined, extra_files=feed_files(feed, history),
+                            index_html=render_shell(), data=structured)
+    print(f"  URL: {url}")
+    return url
+
+def notify(briefing, dashboard_url, bot_token, chat_id):
+    """Pipeline 'sent' stage: 'sent', or 'skipped' when Telegram isn't configured
+
+    Raises when nothing was delivered, so the stage is not checkpointed and
+    --resume sends again.
+    """
+    if not (bot_token and chat_id):
+        print("\n📱 Telegram not configured, not sending")
+        return 'skipped'
+    print("\n📱 Sending to Telegram...")
+    if not send_telegram(bot_token, chat_id, briefing[1], dashboard_url):
+        raise RuntimeError("not delivered to any chat")
+    print("  ✓ Sent")
+    return 'sent'
+
+def notify_stale(bot_token, chat_id, url, budget):
+    """Tell the chat there is no new briefing, so a silent morning isn't mistaken for one"""
+    msg = (f"⚠️ <b>No fresh briefing</b> by {budget.deadline.strftime('%H:%M %Z')}: no transcripts could be analyzed.\n"
+           f"🔗 <a href='{url}'>Last published dashboard</a>")
+    return delivered(telegram_delivery.deliver(bot_token, telegram_delivery.parse_chat_ids(chat_id), msg, parse_mode='HTML'))
+
+def briefing_pipeline(workers=MAX_WORKERS, timeout=SOURCE_TIMEOUT, deadline=None, cutoff=None, download=True,
+                      checkpoint=None, intraday=False):
+    """list videos -> fetch -> analyze -> parse -> record/feed -> render -> publish + notify
+
+    Run inputs: sources (source_registry entries), api_key, bot_token, chat_id and
+    dashboard_url. Telegram links to the site's URL, which is known before
+    the commit lands, so it is sent while the GitHub publish is in flight.
+    timeout bounds each per-item call separately, so a video gets up to
+    timeout for its transcript and again for its analysis. Sources still
+    being fetched or analyzed at `cutoff` are dropped; with
+    download=False only cached transcripts are used. With a checkpoint, stage
+    outputs are saved and already-saved ones reused. intraday publishes only
+    the data feed once the day's page is up.
+    """
+    describe = lambda item: f"{item[0]} {item[1]}"
+    return Pipeline([
+        Stage('videos', partial(find_videos, listing=download), after=('sources',), each=True, workers=workers, timeout=timeout, cutoff=cutoff,
+              describe=lambda source: source['label']),
+        Stage('targets', flatten_videos, after=('videos',)),
+        Stage('fetched', partial(fetch_source, timeout=timeout, download=download), after=('targets',),
+              each=True, workers=workers, timeout=timeout, cutoff=cutoff, describe=describe),
+        Stage('analyzed', partial(analyze_source, timeout=timeout), after=('fetched', 'api_key'),
+              each=True, workers=workers, timeout=timeout, cutoff=cutoff, describe=describe),
+        Stage('results', collect_results, after=('analyzed',)),
+        Stage('briefing', parse_results, after=('results', 'sources')),
+        Stage('recorded', record_setups, after=('results',)),
+        Stage('feed', make_feed, after=('briefing', 'results')),
+        Stage('html', render_dashboard, after=('briefing', 'feed')),
+        Stage('url', partial(publish_dashboard, intraday=intraday), after=('html', 'briefing', 'feed')),
+        Stage('sent', notify, after=('briefing', 'dashboard_url', 'bot_token', 'chat_id')),
+    ], deadline=deadline, checkpoint=checkpoint)
+
+def parse_analysis(text, labels=SOURCE_PREFIXES):
+    data={'market_context':text[:500]}
+    data.update(dashboard_data(extract_setups(text, labels)))
     return data
 
-def main():
+def _option(args, flag, default):
+    """Value after flag, default if flag is given bare, None if absent"""
+    if flag not in args:
+        return None
+    i = args.index(flag)
+    return args[i + 1] if i + 1 < len(args) and not args[i + 1].startswith('-') else default
+
+def main(argv=None):
+    """--deadline [HH:MM]: scheduler mode, ship by then (Pacific time; default 06:30)
+    --resume [RUN_ID]: finish an earlier run (default: the latest) from its checkpoint
+    --intraday: update only data.json if the site already has today's briefing
+    """
+    args = sys.argv[1:] if argv is None else argv
+    clock = _option(args, '--deadline', scheduler.DEADLINE)
+    resume = _option(args, '--resume', '')
+    try:
+        run = checkpoint.Checkpoint.resume(resume or None) if resume is not None else checkpoint.Checkpoint()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    metrics.start_run('combined_briefing', run.run_id)
+    status = 'error'
+    try:
+        status = run_briefing(clock, run, resumed=resume is not None, intraday='--intraday' in args)
+    finally:
+        metrics.finish_run(status, resumed=resume is not None)
+        print(f"\n⏱  Stages:\n{metrics.current_run().report()}")
+        print(f"  Metrics: {metrics.METRICS_PATH}")
+
+def run_briefing(clock=None, run=None, resumed=False, intraday=False):
+    """The whole morning pipeline; returns the run status for the metrics log
+
+    With clock ('HH:MM' Pacific) the run is planned backwards from that
+    deadline and degrades rather than finishing late (see scheduler.py).
+    Stage outputs are saved to the run's checkpoint; when resumed, the
+    sources come from it too and only unfinished stages run.
+    """
+    run = run or checkpoint.Checkpoint()
     print("="*60)
     print("TRADING BRIEFING - Phase 1")
     print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M PT')}")
@@ -110,68 +385,63 @@ def main():
     bot_token = config.get('TELEGRAM_BOT_TOKEN')
     chat_id = config.get('TELEGRAM_CHAT_ID')
     
-    analyses = []
-    
-    # Process VI
-    print("\n📺 Processing Verified Investing...")
-    for url in VERIFIED_INVESTING_URLS:
-        print(f"  {url}")
-        transcript = get_transcript(url)
-        if transcript:
-            print(f"  Transcript: {len(transcript):,} chars")
-            analysis = analyze(transcript, api_key, 'trading')
-            if analysis:
-                analyses.append(f"VI: {analysis}")
-                print("  ✓ Analyzed")
-    
-    # Process Mitch Ray
-    print("\n📺 Processing Mitch Ray...")
-    for url in MITCH_RAY_URLS:
-        print(f"  {url}")
-        transcript = get_transcript(url)
-        if transcript:
-            analysis = analyze(transcript, api_key, 'crypto')
-            if analysis:
-                analyses.append(f"MR: {analysis}")
-                print("  ✓ Analyzed")
-    
-    if not analyses:
-        print("❌ No analyses generated")
-        return
+    workers = int(config.get('MAX_WORKERS', MAX_WORKERS))
+    timeout = int(config.get('SOURCE_TIMEOUT', SOURCE_TIMEOUT))
     
-    combined = "\n\n".join(analyses)
-    structured = parse_analysis(combined)
+    try:
+        budget = scheduler.budget(clock) if clock else None
+    except ValueError as e:  # includes scheduler.DeadlinePassed
+        print(f"❌ {e}")
+        return 'deadline_passed' if isinstance(e, scheduler.DeadlinePassed) else 'error'
+    plan = budget.plan() if budget else 'full'
+    if budget:
+        print(f"⏰ Deadline: {budget.describe()}, plan: {plan}" + (" (cached transcripts only)" if plan == 'cached' else ""))
     
-    # Generate dashboard
-    print("\n📊 Generating dashboard...")
-    html = create_dashboard(structured, combined)
-    DASHBOARD_PATH.write_text(html)
-    print(f"  Saved: {DASHBOARD_PATH}")
-    
-    # Publish to GitHub
-    dashboard_url = f"file://{DASHBOARD_PATH}"
-    if GITHUB_TOKEN and GITHUB_REPO:
-        print("\n🚀 Publishing to GitHub Pages...")
-        try:
-            publisher = GitHubPublisher(GITHUB_REPO, GITHUB_TOKEN)
-            dashboard_url = publisher.publish(html, combined)
-            print(f"  URL: {dashboard_url}")
-        except Exception as e:
-            print(f"  ⚠️ Publish failed: {e}")
-    
-    # Send Telegram
-    if bot_token and chat_id:
-        print("\n📱 Sending to Telegram...")
-        try:
-            send_telegram(bot_token, chat_id, structured, dashboard_url)
-            print("  ✓ Sent")
-        except Exception as e:
-            print(f"  ⚠️ Telegram failed: {e}")
+    if resumed:
+        sources = run.load('sources')
+        if bot_token and chat_id and run.has('sent') and run.load('sent') == 'skipped':
+            run.discard('sent')  # Telegram configured since: send this time
+        print(f"↺ Resuming run {run.run_id}; saved: {', '.join(run.completed()) or 'nothing'}")
+    else:
+        sources = registry().sources
+        run.save('sources', sources)
+        print(f"Run ID: {run.run_id}")
+    print(f"\n📺 Processing {len(sources)} sources ({workers} workers, {timeout}s per fetch/analysis)...")
+    local_url = f"file://{DASHBOARD_PATH}"
+    dashboard_url = GitHubPublisher(GITHUB_REPO, GITHUB_TOKEN).site_url if GITHUB_TOKEN and GITHUB_REPO else local_url
+    pipeline = briefing_pipeline(workers, timeout, deadline=budget and budget.end,
+                                 cutoff=budget and budget.sources_cutoff(), download=plan == 'full', checkpoint=run,
+                                 intraday=intraday)
+    result = pipeline.run(sources=sources, api_key=api_key, bot_token=bot_token, chat_id=chat_id,
+                          dashboard_url=dashboard_url)
+    stats = completion_cache.stats()
+    print(f"  LLM cache: {stats['hits']} hits / {stats['misses']} misses")
+    if result.restored:
+        print(f"  From checkpoint: {', '.join(result.restored)}")
+    
+    if result.status == 'no_analyses':
+        print("❌ No analyses generated")
+        if budget and bot_token and chat_id:
+            if notify_stale(bot_token, chat_id, dashboard_url, budget):
+                print("  Sent no-briefing notice to Telegram")
+            else:
+                print("  ❌ No-briefing notice not delivered")
+        return result.status
+    status = result.status
+    if result.errors and status == 'ok':
+        status = 'partial' if 'html' in result.values else 'error'
+    if status != 'ok':
+        print(f"\n↺ Resume with: python3 combined_briefing.py --resume {run.run_id}")
+    if 'html' not in result.values:
+        return status
     
     # Open locally
     print("\n🌐 Opening dashboard...")
     os.system(f"open {DASHBOARD_PATH}")
-    print(f"\n✅ Done! Dashboard: {dashboard_url}")
+    print(f"\n✅ Done! Dashboard: {result.get('url') or local_url}")
+    if status == 'ok':
+        checkpoint.prune()
+    return status
 
 if __name__ == '__main__':
     main()
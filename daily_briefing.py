@@ -1,82 +1,48 @@
 import os
 import sys
-import subprocess
-import json
 from datetime import datetime
-from openai import OpenAI
+from http_client import openai_client
+from channel_watch import ChannelState, iter_channel, new_videos
+from llm import complete
+from pipeline import Pipeline, Stage, Stop
+from source_registry import matches, registry
+from transcript_compress import compress
+from transcripts import open_subtitles
+from vtt import iter_captions, transcript_text
 
-def get_latest_videos(channel_url, max_results=5):
-    """Get latest video URLs and titles from channel"""
+SOURCE = 'VI'             # sources.json entry: channel and title filters
+TRANSCRIPT_TOKENS = 2000  # compressed transcript sent with the prompt
+
+def get_latest_videos(channel_url, max_results=5, state=None):
+    """Get latest video URLs and titles from channel
+
+    With a ChannelState, only uploads not seen before are returned.
+    """
     try:
-        result = subprocess.run([
-            'yt-dlp', '--flat-playlist', '--dump-json',
-            '--playlist-end', str(max_results),
-            channel_url
-        ], capture_output=True, text=True, timeout=60)
-        
-        videos = []
-        for line in result.stdout.strip().split('\n'):
-            if line:
-                try:
-                    data = json.loads(line)
-                    videos.append({
-                        'title': data.get('title', ''),
-                        'url': f"https://www.youtube.com/watch?v={data['id']}",
-                        'upload_date': data.get('upload_date', '')
-                    })
-                except:
-                    continue
-        return videos
+        if state is not None:
+            return new_videos(channel_url, state, max_results)
+        return list(iter_channel(channel_url, max_results))
     except Exception as e:
         print(f"Error fetching videos: {e}")
         return []
 
-def find_target_video(videos):
-    """Find video matching target titles from today"""
-    target_patterns = [
-        "Today's Best Trade Setups",
-        "My Trading Game Plan",
-        "Best Trade Setups"
-    ]
-    
-    today = datetime.now().strftime('%Y%m%d')
-    
+def find_target_video(videos, source):
+    """First video matching the source's title filters (sources.json)"""
     for video in videos:
-        # Check if uploaded today and matches pattern
-        if any(pattern.lower() in video['title'].lower() for pattern in target_patterns):
+        if matches(source, video['title']):
             return video
     
-    # If no today match, return most recent
+    # If nothing matches, return most recent
     return videos[0] if videos else None
 
 def get_transcript(video_url):
     """Download YouTube transcript"""
     try:
-        # Clean up old files
-        for f in ['/tmp/transcript.en.txt', '/tmp/transcript.en.vtt']:
-            if os.path.exists(f):
-                os.remove(f)
-        
-        result = subprocess.run([
-            'yt-dlp', '--skip-download', '--write-auto-subs',
-            '--sub-langs', 'en', '--convert-subs', 'txt',
-            '--output', '/tmp/transcript', video_url
-        ], capture_output=True, text=True, timeout=120)
-        
-        # Try different transcript file names
-        possible_files = [
-            '/tmp/transcript.en.txt',
-            '/tmp/transcript.en.vtt',
-            '/tmp/transcript.txt'
-        ]
-        
-        for file_path in possible_files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    # Clean up VTT formatting if needed
-                    lines = [line.strip() for line in content.split('\n') if line.strip()]
-                    return ' '.join(lines[:500])  # First 500 lines
+        with open_subtitles(video_url) as f:
+            if f:
+                transcript = transcript_text(iter_captions(f))
+                if transcript:
+                    return transcript
         
         return "No transcript available for this video."
     except Exception as e:
@@ -85,14 +51,14 @@ def get_transcript(video_url):
 def analyze_transcript(title, transcript):
     """Analyze with OpenAI"""
     api_key = open(os.path.expanduser('~/.config/trading-ai/.env')).read().split('=')[1].strip()
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
     
     prompt = f"""Analyze this trading video for a West Coast day trader.
 
 Video Title: {title}
 
 Transcript:
-{transcript[:3000]}
+{compress(transcript, TRANSCRIPT_TOKENS)}
 
 Extract and format as TRADING PLAN:
 1. TICKERS: List each stock/crypto mentioned with directional bias (Bullish/Bearish/Neutral)
@@ -104,53 +70,80 @@ Extract and format as TRADING PLAN:
 
 If multiple setups, list separately. Be concise and actionable."""
 
-    response = client.chat.completions.create(
-        model='gpt-4o-mini',
-        messages=[{'role': 'user', 'content': prompt}],
-        max_tokens=800,
-        temperature=0.3
-    )
-    
-    return response.choices[0].message.content
+    return complete(client, prompt, max_tokens=800, temperature=0.3)
+
+def select_video(videos, state, source):
+    if not videos:
+        raise Stop('no_new' if state is not None else 'no_videos')
+    target = find_target_video(videos, source)
+    if not target:
+        raise Stop('no_target')
+    print(f"\nSelected: {target['title']}")
+    print(f"URL: {target['url']}")
+    return target
+
+def fetch_transcript(target):
+    print("\nDownloading transcript...")
+    transcript = get_transcript(target['url'])
+    if transcript.startswith("Error") or transcript.startswith("No transcript"):
+        print(f"WARNING: {transcript}")
+        print("Attempting analysis from title only...")
+        transcript = f"Video title: {target['title']}. No transcript available."
+    return transcript
+
+def analyze_target(target, transcript):
+    print("Analyzing with AI...")
+    return analyze_transcript(target['title'], transcript)
+
+def mark_seen(analysis, videos, target, state, source):
+    """Mark the briefed video and the uploads before it as seen
+
+    Uploads newer than the target stay unseen for the next run. Older ones
+    are marked because this briefing supersedes them, and new_videos stops
+    reading at the first seen ID, so they could not come up again anyway.
+    """
+    if state is not None:
+        ids = [v['id'] for v in videos]
+        start = ids.index(target['id']) if target['id'] in ids else 0
+        state.mark_seen(source['channel'], videos[start:])
+
+def daily_pipeline(deadline=None):
+    """Run inputs: state (ChannelState or None), source (source_registry entry)"""
+    return Pipeline([
+        Stage('videos', lambda source, state: get_latest_videos(source['channel'], state=state),
+              after=('source', 'state')),
+        Stage('target', select_video, after=('videos', 'state', 'source')),
+        Stage('transcript', fetch_transcript, after=('target',)),
+        Stage('analysis', analyze_target, after=('target', 'transcript')),
+        Stage('seen', mark_seen, after=('analysis', 'videos', 'target', 'state', 'source')),
+    ], deadline=deadline)
 
 if __name__ == '__main__':
+    # --new-only: skip videos already briefed (see channel_watch.py)
+    state = ChannelState() if '--new-only' in sys.argv else None
+    
     print("="*60)
     print("DAILY TRADING BRIEFING - Verified Investing")
     print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print("="*60)
     
-    # Get latest videos
     print("\nFetching latest videos...")
-    videos = get_latest_videos("https://www.youtube.com/@verifiedinvesting/videos")
+    result = daily_pipeline().run(state=state, source=registry().source(SOURCE))
     
-    if not videos:
+    if result.status == 'no_new':
+        print("No new uploads")
+        sys.exit(0)
+    if result.status == 'no_videos':
         print("ERROR: Could not fetch videos")
         sys.exit(1)
-    
-    # Find target video
-    target = find_target_video(videos)
-    if not target:
+    if result.status == 'no_target':
         print("ERROR: No suitable video found")
         sys.exit(1)
-    
-    print(f"\nSelected: {target['title']}")
-    print(f"URL: {target['url']}")
-    
-    # Get transcript
-    print("\nDownloading transcript...")
-    transcript = get_transcript(target['url'])
-    
-    if transcript.startswith("Error") or transcript.startswith("No transcript"):
-        print(f"WARNING: {transcript}")
-        print("Attempting analysis from title only...")
-        transcript = f"Video title: {target['title']}. No transcript available."
-    
-    # Analyze
-    print("Analyzing with AI...")
-    analysis = analyze_transcript(target['title'], transcript)
+    if 'analysis' not in result.values:
+        sys.exit(1)
     
     print("\n" + "="*60)
     print("TRADING PLAN")
     print("="*60)
-    print(analysis)
+    print(result['analysis'])
     print("="*60)
@@ -0,0 +1,360 @@
+"""Precompiled dashboard templates.
+
+Each page is split once, at import, into literal text and {name} slots, with
+the stylesheet and other static parts already folded into the literals.
+Rendering a dashboard only formats the cards and joins a short list, so
+rendering many pages (per user, per watchlist, per archive rebuild) costs
+just the dynamic part.
+
+Layouts:
+    render_compact(data)               combined_briefing.py's dashboard
+    render_shell(feed=None)            the same page, rendered client-side from data.json
+    render_full(data, briefing_text)   generate_dashboard.py's dashboard
+"""
+import json
+import string
+from datetime import datetime
+from html import escape
+
+
+class Template:
+    """Literal text with {name} slots, split once at construction
+
+    Slots named in `static` are folded into the literal text up front, so
+    render() only joins the literal pieces with the slot values. Slots
+    missing from render()'s arguments render as None, like the .get()
+    lookups of the hand-written f-strings this replaces; extra keys are
+    ignored, so render(cls=..., **card_dict) works.
+    """
+
+    def __init__(self, source, **static):
+        literals, names, literal = [], [], ''
+        for text, name, _, _ in string.Formatter().parse(source):
+            literal += text
+            if name is None:
+                continue
+            if name in static:
+                literal += static[name]
+                continue
+            literals.append(literal)
+            names.append(name)
+            literal = ''
+        self._head = literals[0] if literals else literal
+        # (slot, literal text after it)
+        self._pieces = tuple(zip(names, literals[1:] + [literal])) if names else ()
+        self.slots = tuple(dict.fromkeys(names))
+
+    def render(self, **values):
+        out = [self._head]
+        for name, literal in self._pieces:
+            out.append(format(values.get(name)))
+            out.append(literal)
+        return ''.join(out)
+
+
+# --- compact layout (combined_briefing.py) -----------------------------------
+
+COMPACT_CSS = """:root{--bg:#0d1117;--bg2:#161b22;--bg3:#21262d;--border:#30363d;--text:#f0f6fc;--text2:#8b949e;--blue:#58a6ff;--green:#238636;--red:#da3633}*{margin:0;padding:0;box-sizing:border-box}body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:var(--bg);color:var(--text);line-height:1.6;padding-bottom:40px}.header{background:linear-gradient(135deg,var(--bg2) 0%,var(--bg3) 100%);padding:30px 20px;border-bottom:1px solid var(--border);position:sticky;top:0;z-index:100}.header h1{font-size:28px;font-weight:700;background:linear-gradient(90deg,var(--blue),#a371f7);-webkit-background-clip:text;-webkit-text-fill-color:transparent}.meta{color:var(--text2);font-size:14px}.container{padding:20px;max-width:600px;margin:0 auto}.section{margin-bottom:24px}.section-title{font-size:18px;font-weight:600;margin-bottom:16px;display:flex;align-items:center;gap:8px}.section-title::before{content:'';width:4px;height:20px;background:var(--blue);border-radius:2px}.card{background:var(--bg2);border:1px solid var(--border);border-radius:12px;padding:16px;margin-bottom:12px}.ticker-row{display:flex;justify-content:space-between;align-items:center;margin-bottom:12px}.ticker{font-size:24px;font-weight:700;color:var(--blue)}.badge{padding:4px 12px;border-radius:20px;font-size:12px;font-weight:600}.bull{background:rgba(35,134,54,.2);color:#3fb950}.bear{background:rgba(218,54,51,.2);color:#f85149}.grid{display:grid;grid-template-columns:repeat(3,1fr);gap:8px}.two{grid-template-columns:repeat(2,1fr)}.box{background:var(--bg3);padding:12px;border-radius:8px;text-align:center}.support{border:1px solid rgba(63,185,80,.3)}.resist{border:1px solid rgba(248,81,73,.3)}.label{font-size:11px;color:var(--text2);text-transform:uppercase;margin-bottom:4px}.price{font-size:16px;font-weight:700}.alert{background:linear-gradient(135deg,rgba(218,54,51,.2) 0%,rgba(182,35,36,.2) 100%);border:1px solid var(--red);border-radius:12px;padding:16px;margin-top:20px}.alert h3{color:#f85149;font-size:14px;margin-bottom:8px}"""
+
+COMPACT_SHELL = """<!DOCTYPE html><html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>Trading Briefing</title>{style}</head><body><div class="header"><h1>Trading Briefing</h1><div class="meta">{date}</div></div><div class="container"><div class="section"><div class="section-title">Equity Setups</div>{equities}</div><div class="section"><div class="section-title">Crypto Levels</div>{crypto}</div>{risk}</div></body></html>"""
+
+COMPACT_RISK = """<div class="alert"><h3>⚠️ Risk Management</h3><ul style="list-style:none;font-size:14px;color:var(--text2)"><li style="margin-bottom:4px">• Don't trade past 9:30 AM PT</li><li style="margin-bottom:4px">• Max 3% risk per trade</li><li>• Set stops immediately</li></ul></div>"""
+
+COMPACT_EQUITY = Template('<div class="card"><div class="ticker-row"><span class="ticker">{ticker}</span><span class="badge {cls}">{bias}</span></div><div class="grid"><div class="box"><div class="label">Entry</div><div class="price">{entry}</div></div><div class="box support"><div class="label">Stop</div><div class="price">{stop}</div></div><div class="box resist"><div class="label">Target</div><div class="price">{target}</div></div></div></div>')
+COMPACT_CRYPTO = Template('<div class="card"><div class="ticker-row"><span class="ticker">{name}</span><span class="badge {cls}">{bias}</span></div><div class="grid two"><div class="box support"><div class="label">Support</div><div class="price">{support}</div></div><div class="box resist"><div class="label">Resistance</div><div class="price">{resist}</div></div></div></div>')
+COMPACT_NO_EQUITIES = '<div style="text-align:center;padding:40px;color:var(--text2)">No setups</div>'
+COMPACT_NO_CRYPTO = '<div style="text-align:center;padding:40px;color:var(--text2)">No crypto data</div>'
+
+_compact_inline = Template(COMPACT_SHELL, style=f'<style>{COMPACT_CSS}</style>', risk=COMPACT_RISK)
+
+
+def render_compact(data, date=None):
+    """Dashboard page for combined_briefing.py: up to 5 equity and 3 crypto cards"""
+    equities = ''.join([
+        COMPACT_EQUITY.render(cls=_bias_class(eq, 'bull', 'bear'), **eq)
+        for eq in data.get('equities', [])[:5]])
+    crypto = ''.join([
+        COMPACT_CRYPTO.render(cls=_bias_class(c, 'bull', 'bear'), **c)
+        for c in data.get('crypto', [])[:3]])
+    return _compact_inline.render(date=date or datetime.now().strftime('%Y-%m-%d %H:%M PT'),
+                                  equities=equities or COMPACT_NO_EQUITIES, crypto=crypto or COMPACT_NO_CRYPTO)
+
+
+# --- static shell: the compact layout rendered in the browser from data.json --
+
+SHELL_JS = """const $=s=>document.querySelector(s);
+const esc=v=>String(v??'—').replace(/[&<>"]/g,c=>({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'})[c]);
+const badge=x=>`<span class="badge ${x.bias==='Bullish'?'bull':'bear'}">${esc(x.bias)}</span>`;
+const box=(cls,label,v)=>`<div class="box ${cls}"><div class="label">${label}</div><div class="price">${esc(v)}</div></div>`;
+const empty=t=>`<div style="text-align:center;padding:40px;color:var(--text2)">${t}</div>`;
+let revision=null;
+function render(feed){
+  if(!feed||feed.revision===revision)return;
+  revision=feed.revision;
+  $('#date').textContent=feed.generated.replace('T',' ').slice(0,16)+' PT';
+  $('#equities').innerHTML=(feed.equities||[]).slice(0,5).map(e=>`<div class="card"><div class="ticker-row"><span class="ticker">${esc(e.ticker)}</span>${badge(e)}</div><div class="grid">${box('','Entry',e.entry)}${box('support','Stop',e.stop)}${box('resist','Target',e.target)}</div></div>`).join('')||empty('No setups');
+  $('#crypto').innerHTML=(feed.crypto||[]).slice(0,3).map(c=>`<div class="card"><div class="ticker-row"><span class="ticker">${esc(c.name)}</span>${badge(c)}</div><div class="grid two">${box('support','Support',c.support)}${box('resist','Resistance',c.resist)}</div></div>`).join('')||empty('No crypto data');
+}
+function load(){
+  fetch('data.json?t='+Date.now(),{cache:'no-store'}).then(r=>r.ok?r.json():null).then(render).catch(()=>{});
+}
+const inline=JSON.parse($('#feed').textContent);
+if(inline)render(inline);else load();
+if(location.protocol!=='file:')setInterval(load,300000);"""
+
+_shell = Template(
+    COMPACT_SHELL.replace('{date}', '<span id="date"></span>')
+    .replace('{equities}', '<div id="equities"></div>')
+    .replace('{crypto}', '<div id="crypto"></div>')
+    .replace('</body>', '<script id="feed" type="application/json">{feed}</script><script>{script}</script></body>'),
+    style=f'<style>{COMPACT_CSS}</style>', risk=COMPACT_RISK, script=SHELL_JS)
+
+
+def render_shell(feed=None):
+    """Compact dashboard that renders data.json client-side and re-polls it
+
+    Without a feed the page is fully static and can be cached indefinitely.
+    Pass a feed (data_feed.build_feed) to inline it, for copies opened from
+    disk, where the browser cannot fetch data.json.
+    """
+    inline = 'null' if feed is None else json.dumps(feed, separators=(',', ':')).replace('</', '<\\/')
+    return _shell.render(feed=inline)
+
+
+# --- full layout (generate_dashboard.py) -------------------------------------
+
+FULL_CSS = """        * { box-sizing: border-box; margin: 0; padding: 0; }
+        body { 
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
+            background: #0d1117; 
+            color: #c9d1d9; 
+            line-height: 1.5;
+            padding-bottom: 40px;
+        }
+        .header { 
+            background: linear-gradient(135deg, #161b22 0%, #21262d 100%); 
+            padding: 24px 20px; 
+            border-bottom: 1px solid #30363d;
+            position: sticky;
+            top: 0;
+            z-index: 100;
+        }
+        .header h1 { 
+            font-size: 28px; 
+            font-weight: 700;
+            background: linear-gradient(90deg, #58a6ff, #a371f7);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 4px;
+        }
+        .header .time { 
+            color: #8b949e; 
+            font-size: 14px; 
+            font-weight: 500;
+        }
+        .container { padding: 16px; }
+        .card { 
+            background: #161b22; 
+            border: 1px solid #30363d;
+            border-radius: 16px; 
+            margin-bottom: 16px;
+            overflow: hidden;
+        }
+        .card-header { 
+            background: #21262d;
+            padding: 16px 20px;
+            border-bottom: 1px solid #30363d;
+        }
+        .card-header h2 { 
+            font-size: 18px; 
+            font-weight: 600;
+            color: #f0f6fc;
+            display: flex;
+            align-items: center;
+            gap: 8px;
+        }
+        .card-body { padding: 16px; }
+        .setup { 
+            background: #0d1117;
+            border: 1px solid #30363d;
+            border-radius: 12px; 
+            padding: 16px;
+            margin-bottom: 12px;
+        }
+        .setup:last-child { margin-bottom: 0; }
+        .ticker { 
+            font-size: 24px; 
+            font-weight: 700;
+            color: #58a6ff;
+            margin-bottom: 12px;
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+        }
+        .bias-bull { 
+            background: #238636; 
+            color: white;
+            padding: 4px 12px;
+            border-radius: 20px;
+            font-size: 12px;
+            font-weight: 600;
+        }
+        .bias-bear { 
+            background: #da3633; 
+            color: white;
+            padding: 4px 12px;
+            border-radius: 20px;
+            font-size: 12px;
+            font-weight: 600;
+        }
+        .levels { 
+            display: grid;
+            grid-template-columns: repeat(3, 1fr);
+            gap: 12px;
+        }
+        .level { 
+            text-align: center;
+            padding: 12px 8px;
+            background: #21262d;
+            border-radius: 8px;
+        }
+        .level .label { 
+            font-size: 11px; 
+            color: #8b949e;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            margin-bottom: 4px;
+        }
+        .level .price { 
+            font-size: 16px; 
+            font-weight: 700;
+            color: #f0f6fc;
+        }
+        .support { color: #3fb950 !important; }
+        .resist { color: #f85149 !important; }
+        .alert { 
+            background: linear-gradient(135deg, #da3633 0%, #b62324 100%);
+            color: white;
+            padding: 16px 20px;
+            border-radius: 12px;
+            margin-top: 16px;
+        }
+        .alert h3 {
+            font-size: 14px;
+            font-weight: 600;
+            margin-bottom: 8px;
+            opacity: 0.9;
+        }
+        .raw-text {
+            background: #0d1117;
+            border: 1px solid #30363d;
+            border-radius: 12px;
+            padding: 16px;
+            font-size: 13px;
+            line-height: 1.6;
+            color: #8b949e;
+            white-space: pre-wrap;
+            max-height: 300px;
+            overflow-y: auto;
+        }
+        .toggle-btn {
+            background: #21262d;
+            border: 1px solid #30363d;
+            color: #58a6ff;
+            padding: 12px 20px;
+            border-radius: 8px;
+            font-size: 14px;
+            font-weight: 600;
+            width: 100%;
+            margin-top: 16px;
+            cursor: pointer;
+        }"""
+
+FULL_SHELL = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+    <title>Trading Briefing</title>
+    {style}
+</head>
+<body>
+    <div class="header">
+        <h1>📊 Trading Briefing</h1>
+        <div class="time">{date}</div>
+    </div>
+
+    <div class="container">
+        <div class="card">
+            <div class="card-header">
+                <h2>🎯 Equity Setups</h2>
+            </div>
+            <div class="card-body">
+                {equities}
+            </div>
+        </div>
+
+        <div class="card">
+            <div class="card-header">
+                <h2>₿ Crypto Levels</h2>
+            </div>
+            <div class="card-body">
+                {crypto}
+            </div>
+        </div>
+
+        {risk}
+
+        <button class="toggle-btn" onclick="document.getElementById('raw').style.display='block';this.style.display='none';">
+            Show Full Text Briefing
+        </button>
+
+        <div id="raw" style="display:none; margin-top:16px;">
+            <div class="raw-text">{raw}</div>
+        </div>
+    </div>
+</body>
+</html>'''
+
+FULL_RISK = '''<div class="alert">
+            <h3>⚠️ Risk Management</h3>
+            <div>Don't trade past 9:30 AM PT. Max 3% risk per trade.</div>
+        </div>'''
+
+FULL_EQUITY = Template('''
+        <div class="setup">
+            <div class="ticker">{ticker} <span class="{cls}">{bias}</span></div>
+            <div class="levels">
+                <div class="level"><div class="label">Entry</div><div class="price">{entry}</div></div>
+                <div class="level"><div class="label">Stop</div><div class="price support">{stop}</div></div>
+                <div class="level"><div class="label">Target</div><div class="price resist">{target}</div></div>
+            </div>
+        </div>''')
+FULL_CRYPTO = Template('''
+        <div class="setup">
+            <div class="ticker">{name} <span class="{cls}">{bias}</span></div>
+            <div class="levels">
+                <div class="level"><div class="label">Support</div><div class="price support">{support}</div></div>
+                <div class="level"><div class="label">Resistance</div><div class="price resist">{resist}</div></div>
+            </div>
+        </div>''')
+FULL_NO_EQUITIES = '<div class="setup"><div class="ticker">No specific setups found</div></div>'
+FULL_NO_CRYPTO = '<div class="setup"><div class="ticker">No crypto data</div></div>'
+
+_full_inline = Template(FULL_SHELL, style=f'<style>\n{FULL_CSS}\n    </style>', risk=FULL_RISK)
+
+
+def render_full(data, briefing_text):
+    """Dashboard page for generate_dashboard.py: up to 3 equity cards, all crypto, raw text"""
+    equities = ''.join([
+        FULL_EQUITY.render(cls=_bias_class(eq, 'bias-bull', 'bias-bear'), **eq)
+        for eq in data['equities'][:3]])
+    crypto = ''.join([
+        FULL_CRYPTO.render(cls=_bias_class(c, 'bias-bull', 'bias-bear'), **c)
+        for c in data['crypto']])
+    return _full_inline.render(date=data['date'], equities=equities or FULL_NO_EQUITIES,
+                               crypto=crypto or FULL_NO_CRYPTO, raw=escape(briefing_text, quote=False))
+
+
+def _bias_class(item, bull, bear):
+    return bull if item.get('bias') == 'Bullish' else bear
@@ -0,0 +1,67 @@
+"""Structured briefing feed: data.json plus a per-day NDJSON history.
+
+The dashboard shell (dashboard_templates.render_shell) fetches data.json and
+renders it in the browser, so an intraday update is a small JSON write and
+the shell itself never changes. Each feed record carries the schema version
+and a revision hash of its content, which the shell uses to skip re-rendering
+unchanged data.
+
+Every record is also appended to ~/trading-ai/feed/YYYY-MM-DD.ndjson, one
+line per run, which is published as data/YYYY-MM-DD.ndjson.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from paths import WORK_DIR
+
+SCHEMA_VERSION = 1
+FEED_DIR = os.path.join(WORK_DIR, 'feed')
+DATA_PATH = 'data.json'
+
+
+def build_feed(data, generated=None, sources=None):
+    """Feed record from parse_analysis()/parse_briefing() output"""
+    generated = generated or datetime.now()
+    feed = {
+        'version': SCHEMA_VERSION,
+        'generated': generated.isoformat(timespec='seconds'),
+        'date': generated.strftime('%Y-%m-%d'),
+        'market_context': data.get('market_context', ''),
+        'equities': data.get('equities', []),
+        'crypto': data.get('crypto', []),
+    }
+    if sources:
+        feed['sources'] = sources
+    # revision covers the content only, so re-publishing identical data is a no-op for clients
+    content = {k: v for k, v in feed.items() if k not in ('generated', 'date')}
+    feed['revision'] = hashlib.sha256(dumps(content).encode()).hexdigest()[:12]
+    return feed
+
+
+def dumps(feed):
+    """Compact, key-sorted JSON"""
+    return json.dumps(feed, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+
+
+def ndjson_path(date, feed_dir=FEED_DIR):
+    return os.path.join(feed_dir, f'{date}.ndjson')
+
+
+def append_history(feed, feed_dir=FEED_DIR):
+    """Append feed to its day's NDJSON file; returns the file's full contents"""
+    os.makedirs(feed_dir, exist_ok=True)
+    path = ndjson_path(feed['date'], feed_dir)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(dumps(feed) + '\n')
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def feed_files(feed, history=None):
+    """{path: content} to publish: data.json and, with history, data/<date>.ndjson"""
+    files = {DATA_PATH: dumps(feed)}
+    if history is not None:
+        files[f"data/{feed['date']}.ndjson"] = history
+    return files
@@ -0,0 +1,105 @@
+"""Shared outbound HTTP for Telegram, GitHub and OpenAI.
+
+One keep-alive requests.Session (pooled per host) serves every blocking call,
+and one OpenAI client is kept per API key, so repeated messages, files and
+completions reuse warm TCP/TLS connections instead of handshaking each time.
+
+Async callers use arequest(); with httpx installed it runs on a pooled
+httpx.AsyncClient (HTTP/2 when the h2 package is present), otherwise it runs
+the blocking session in a worker thread.
+
+Never set credentials on the shared session: pass them per request.
+"""
+import asyncio
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2 = httpx is not None
+except ImportError:
+    HTTP2 = False
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+POOL_SIZE = 16
+LLM_TIMEOUT = 120
+
+_lock = threading.Lock()
+_session = None
+_async_clients = {}   # event loop -> httpx.AsyncClient
+_openai_clients = {}  # api key -> OpenAI
+
+
+def session():
+    """The process-wide pooled requests.Session"""
+    global _session
+    with _lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            s.mount('https://', adapter)
+            s.mount('http://', adapter)
+            _session = s
+        return _session
+
+
+def request(method, url, timeout=None, **kwargs):
+    """session().request with the default (connect, read) timeouts"""
+    return session().request(method, url, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT), **kwargs)
+
+
+def async_client():
+    """Pooled httpx.AsyncClient for the running event loop (httpx only)"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=HTTP2,
+                timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE))
+            _async_clients[loop] = client
+        return client
+
+
+async def arequest(method, url, timeout=None, **kwargs):
+    """Async request; the response has status_code, headers, text, json(), raise_for_status()"""
+    if httpx is None:
+        return await asyncio.to_thread(request, method, url, timeout, **kwargs)
+    if timeout is not None:
+        kwargs['timeout'] = timeout
+    return await async_client().request(method, url, **kwargs)
+
+
+async def aclose():
+    """Close the async client of the running loop (call before the loop ends)"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def openai_client(api_key):
+    """One OpenAI client (and connection pool) per API key"""
+    with _lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            from openai import OpenAI
+            # retries are llm.complete's job (Retry-After aware, outside the API slot)
+            kwargs = {'api_key': api_key, 'timeout': LLM_TIMEOUT, 'max_retries': 0}
+            if HTTP2:
+                kwargs['http_client'] = httpx.Client(
+                    http2=True, timeout=LLM_TIMEOUT,
+                    limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE))
+            client = OpenAI(**kwargs)
+            _openai_clients[api_key] = client
+        return client
@@ -0,0 +1,177 @@
+"""OpenAI chat completions behind a persistent response cache.
+
+Identical requests (same model, prompt, temperature and max_tokens) are
+answered from a SQLite file instead of the API, so re-running the pipeline
+after a late failure (publish, Telegram) costs no tokens and no latency.
+
+API calls share a process-wide semaphore (LLM_CONCURRENCY) so fan-out
+callers cannot flood the rate limit. Retries happen here only (the client is
+built with max_retries=0): 429s, server errors and dropped connections are
+retried with exponential backoff, honouring Retry-After when the API sends
+one, and the slot is released while waiting.
+"""
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+import metrics
+from paths import CACHE_DIR
+
+DEFAULT_MODEL = 'gpt-4o-mini'
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, 'llm.sqlite3')
+LLM_CACHE_MAX_ENTRIES = 5000
+LLM_CACHE_MAX_AGE = 30 * 24 * 3600
+LLM_CONCURRENCY = int(os.environ.get('LLM_CONCURRENCY', '5'))
+LLM_RETRIES = 4
+LLM_BACKOFF = 2.0  # seconds, doubled per attempt
+
+_api_slots = threading.BoundedSemaphore(LLM_CONCURRENCY)
+
+
+class CompletionCache:
+    """SQLite-backed completion store with LRU + max-age eviction"""
+
+    def __init__(self, path=LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES, max_age=LLM_CACHE_MAX_AGE):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            conn.execute('''CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                content TEXT NOT NULL,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS completions_last_used ON completions(last_used)')
+            self._ready = True
+        return conn
+
+    @staticmethod
+    def key(model, messages, temperature=None, max_tokens=None):
+        prompt_digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+        raw = json.dumps([model, prompt_digest, temperature, max_tokens])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT content FROM completions WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                with conn:
+                    conn.execute('UPDATE completions SET last_used = ?, hits = hits + 1 WHERE key = ?',
+                                 (time.time(), key))
+                self.hits += 1
+                return row[0]
+            finally:
+                conn.close()
+
+    def put(self, key, model, content, prompt_tokens=None, completion_tokens=None):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute('INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?, ?, 0)',
+                                 (key, model, content, prompt_tokens, completion_tokens, now, now))
+                    self._evict(conn, now)
+            finally:
+                conn.close()
+
+    def _evict(self, conn, now):
+        conn.execute('DELETE FROM completions WHERE last_used < ?', (now - self.max_age,))
+        conn.execute('''DELETE FROM completions WHERE key IN (
+            SELECT key FROM completions ORDER BY last_used DESC LIMIT -1 OFFSET ?)''', (self.max_entries,))
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+completion_cache = CompletionCache()
+
+
+RETRY_STATUSES = {408, 409, 429}  # plus any 5xx, as the OpenAI SDK's own retry policy
+RETRY_ERRORS = ('APIConnectionError', 'APITimeoutError')
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retrying error, or None if it should not be retried"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        if type(error).__name__ in RETRY_ERRORS:
+            return LLM_BACKOFF * 2 ** attempt + random.uniform(0, 1)
+        return None
+    if status not in RETRY_STATUSES and status < 500:
+        return None
+    response = getattr(error, 'response', None)
+    retry_after = getattr(response, 'headers', {}).get('retry-after') if response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return LLM_BACKOFF * 2 ** attempt + random.uniform(0, 1)
+
+
+def _create(client, kwargs, retries, span=None):
+    for attempt in range(retries + 1):
+        try:
+            with _api_slots:
+                return client.chat.completions.create(**kwargs)
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == retries:
+                raise
+            if span is not None:
+                span.add(retries=1)
+            time.sleep(delay)
+
+
+def complete(client, prompt, model=DEFAULT_MODEL, max_tokens=800, temperature=None, timeout=None,
+             cache=completion_cache, retries=LLM_RETRIES):
+    """Single-message chat completion; returns the reply text
+
+    prompt may be a string (sent as one user message) or a messages list.
+    Pass cache=None to always hit the API. Rate-limited (429), server-error
+    and connection-failure calls are retried up to `retries` times.
+    """
+    messages = [{'role': 'user', 'content': prompt}] if isinstance(prompt, str) else prompt
+    key = CompletionCache.key(model, messages, temperature, max_tokens)
+    with metrics.span('llm', model=model) as span:
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                span.set(cached=True)
+                return cached
+
+        kwargs = {'model': model, 'messages': messages, 'max_tokens': max_tokens}
+        if temperature is not None:
+            kwargs['temperature'] = temperature
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        response = _create(client, kwargs, retries, span)
+        content = response.choices[0].message.content
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = getattr(usage, 'prompt_tokens', None)
+        completion_tokens = getattr(usage, 'completion_tokens', None)
+        span.add(tokens_in=prompt_tokens, tokens_out=completion_tokens)
+
+        if cache is not None and content:
+            cache.put(key, model, content, prompt_tokens, completion_tokens)
+        return content
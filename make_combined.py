@@ -6,7 +6,8 @@ import subprocess
 import json
 import re
 from datetime import datetime
-from openai import OpenAI
+from http_client import openai_client
+from llm import complete
 
 def get_latest_video(channel_url):
     try:
@@ -88,17 +89,13 @@ def fetch_verified_investing():
         return None, 'No VI transcript'
     
     api_key = open(os.path.expanduser('~/.config/trading-ai/.env')).read().split('=')[1].strip()
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
     
-    response = client.chat.completions.create(
-        model='gpt-4o-mini',
-        messages=[{'role': 'user', 'content': 'Extract key trading setups. List: Tickers, entry levels, stops, targets, patterns, confidence. Transcript: ' + transcript[:6000]}],
-        max_tokens=800
-    )
+    analysis = complete(client, 'Extract key trading setups. List: Tickers, entry levels, stops, targets, patterns, confidence. Transcript: ' + transcript[:6000], max_tokens=800)
     
     return {
         'title': video['title'],
-        'analysis': response.choices[0].message.content
+        'analysis': analysis
     }, None
 
 def fetch_mitch_ray():
@@ -114,22 +111,18 @@ def fetch_mitch_ray():
     normalized = normalize_prices(transcript)
     
     api_key = open(os.path.expanduser('~/.config/trading-ai/.env')).read().split('=')[1].strip()
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
     
-    response = client.chat.completions.create(
-        model='gpt-4o-mini',
-        messages=[{'role': 'user', 'content': 'Extract crypto setups. List: BTC/ETH/altcoins, levels, patterns, candlesticks, indicators, bias. Transcript: ' + normalized[:6000]}],
-        max_tokens=800
-    )
+    analysis = complete(client, 'Extract crypto setups. List: BTC/ETH/altcoins, levels, patterns, candlesticks, indicators, bias. Transcript: ' + normalized[:6000], max_tokens=800)
     
     return {
         'title': video['title'],
-        'analysis': response.choices[0].message.content
+        'analysis': analysis
     }, None
 
 def synthesize(vi_data, mr_data):
     api_key = open(os.path.expanduser('~/.config/trading-ai/.env')).read().split('=')[1].strip()
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
     
     print('Synthesizing...')
     
@@ -152,13 +145,7 @@ RISK MANAGEMENT
 EXECUTION CHECKLIST
 KEY LEVELS'''
     
-    response = client.chat.completions.create(
-        model='gpt-4o-mini',
-        messages=[{'role': 'user', 'content': prompt}],
-        max_tokens=1500
-    )
-    
-    return response.choices[0].message.content
+    return complete(client, prompt, max_tokens=1500)
 
 if __name__ == '__main__':
     print('='*60)
@@ -0,0 +1,140 @@
+"""Per-run stage timing.
+
+Code wraps each pipeline stage in a span and attaches counters to it:
+
+    with metrics.span('subtitles', video=vid) as s:
+        path = download(...)
+        s.add(bytes=os.path.getsize(path))
+
+Spans land on the current run (start_run()). finish_run() appends one JSON
+line to ~/trading-ai/logs/metrics.jsonl with the run's wall time, status, a
+per-stage summary (count, wall seconds, bytes, retries, tokens in/out,
+errors) and the individual spans, so runs can be compared across days.
+Spans opened outside a run are timed but not kept.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from paths import WORK_DIR
+
+METRICS_PATH = os.path.join(WORK_DIR, 'logs', 'metrics.jsonl')
+COUNTERS = ('bytes', 'retries', 'tokens_in', 'tokens_out')
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'counters', 'offset', 'wall', 'error')
+
+    def __init__(self, name, attrs, offset):
+        self.name = name
+        self.attrs = attrs
+        self.counters = {}
+        self.offset = offset
+        self.wall = None
+        self.error = None
+
+    def add(self, **counters):
+        """Increment counters (bytes=..., retries=..., tokens_in=..., tokens_out=...)"""
+        for key, value in counters.items():
+            if value:
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def as_dict(self):
+        out = {'name': self.name, 'at': round(self.offset, 3), 'wall': round(self.wall or 0, 3)}
+        out.update(self.attrs)
+        out.update(self.counters)
+        if self.error:
+            out['error'] = self.error
+        return out
+
+
+class Run:
+    def __init__(self, name, run_id=None, keep=True):
+        self.name = name
+        self.keep = keep
+        self.id = run_id or time.strftime('%Y%m%d-%H%M%S')
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **attrs):
+        s = Span(name, attrs, time.perf_counter() - self._t0)
+        try:
+            yield s
+        except GeneratorExit:  # a generator closed early, not a failure
+            raise
+        except BaseException as e:
+            s.error = type(e).__name__
+            raise
+        finally:
+            s.wall = time.perf_counter() - self._t0 - s.offset
+            if self.keep:
+                with self._lock:
+                    self.spans.append(s)
+
+    def stages(self):
+        """{stage: totals}, in order of first appearance"""
+        out = {}
+        with self._lock:
+            spans = list(self.spans)
+        for s in sorted(spans, key=lambda s: s.offset):
+            stage = out.setdefault(s.name, {'count': 0, 'wall': 0.0, 'errors': 0})
+            stage['count'] += 1
+            stage['wall'] += s.wall
+            stage['errors'] += s.error is not None
+            for key, value in s.counters.items():
+                stage[key] = stage.get(key, 0) + value
+        for stage in out.values():
+            stage['wall'] = round(stage['wall'], 3)
+        return out
+
+    def record(self, status='ok', **extra):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.offset)
+        return dict({'run': self.name, 'id': self.id,
+                     'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+                     'wall': round(time.perf_counter() - self._t0, 3), 'status': status,
+                     'stages': self.stages(), 'spans': [s.as_dict() for s in spans]}, **extra)
+
+    def report(self):
+        """Per-stage summary as printable lines (wall is summed over concurrent spans)"""
+        lines = []
+        for name, stage in self.stages().items():
+            extra = ''.join(f' {key}={stage[key]:,}' for key in COUNTERS if stage.get(key))
+            errors = f" errors={stage['errors']}" if stage['errors'] else ''
+            lines.append(f"  {name:<16}{stage['count']:>4}x {stage['wall']:>8.2f}s{extra}{errors}")
+        return '\n'.join(lines)
+
+
+_current = Run('default', keep=False)  # long-lived processes never start a run
+
+
+def start_run(name, run_id=None):
+    global _current
+    _current = Run(name, run_id)
+    return _current
+
+
+def current_run():
+    return _current
+
+
+def span(name, **attrs):
+    """Context manager timing one stage on the current run"""
+    return _current.span(name, **attrs)
+
+
+def finish_run(status='ok', path=METRICS_PATH, **extra):
+    """Append the current run's record to the metrics log and return it"""
+    record = _current.record(status, **extra)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    return record
@@ -1,87 +1,48 @@
 import os
 import sys
-import subprocess
-import json
-import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
-from openai import OpenAI
-
-def get_latest_video(channel_url):
+from http_client import openai_client
+from channel_watch import ChannelState, iter_channel, new_videos
+from llm import complete
+from pipeline import Pipeline, Stage, Stop
+from source_registry import registry
+from transcript_index import TranscriptIndex
+from transcripts import open_subtitles
+from vtt import iter_captions, transcript_text
+
+SOURCE = 'MR'  # sources.json entry: channel and price normalize rules
+
+def get_latest_video(channel_url, state=None):
+    """Newest upload, or with a ChannelState the newest one not seen before"""
     try:
-        result = subprocess.run([
-            'yt-dlp', '--flat-playlist', '--dump-json',
-            '--playlist-end', '1', channel_url
-        ], capture_output=True, text=True, timeout=60)
-        
-        for line in result.stdout.strip().split('\n'):
-            if line:
-                try:
-                    data = json.loads(line)
-                    return {
-                        'title': data.get('title', ''),
-                        'url': f"https://www.youtube.com/watch?v={data['id']}",
-                        'upload_date': data.get('upload_date', ''),
-                        'duration': data.get('duration', 0)
-                    }
-                except:
-                    continue
-        return None
+        if state is not None:
+            videos = new_videos(channel_url, state, max_results=5)
+            return videos[0] if videos else None
+        with closing(iter_channel(channel_url, 1)) as videos:
+            return next(videos, None)
     except Exception as e:
         print(f"Error: {e}")
         return None
 
-def get_transcript(video_url):
-    for f in ['/tmp/mitch.en.vtt', '/tmp/mitch.vtt']:
-        if os.path.exists(f):
-            os.remove(f)
-    
+def get_transcript_cues(video_url):
     print("Downloading transcript...")
-    subprocess.run([
-        'yt-dlp', '--skip-download', '--write-auto-subs',
-        '--sub-langs', 'en', '--sub-format', 'vtt',
-        '--output', '/tmp/mitch', video_url
-    ], capture_output=True, timeout=180)
-    
-    vtt_file = '/tmp/mitch.en.vtt' if os.path.exists('/tmp/mitch.en.vtt') else '/tmp/mitch.vtt'
-    
-    if not os.path.exists(vtt_file):
-        return None
-    
-    with open(vtt_file, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-    
-    lines = []
-    for line in content.split('\n'):
-        line = line.strip()
-        if not line or '-->' in line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-            continue
-        line = re.sub(r'<[^>]+>', '', line)
-        if line:
-            lines.append(line)
-    
-    seen = set()
-    unique_lines = []
-    for line in lines:
-        if line not in seen:
-            seen.add(line)
-            unique_lines.append(line)
-    
-    return ' '.join(unique_lines)
+    with open_subtitles(video_url, timeout=180) as f:
+        if f is None:
+            return []
+        return list(iter_captions(f))
+
+def get_transcript(video_url):
+    return transcript_text(get_transcript_cues(video_url)) or None
 
 def normalize_prices_in_transcript(transcript):
-    def expand_k(match):
-        number = match.group(1)
-        if '.' in number:
-            return str(int(float(number) * 1000))
-        else:
-            return str(int(number) * 1000)
-    
-    transcript = re.sub(r'(\d+\.?\d*)\s*[Kk]\b', expand_k, transcript)
-    return transcript
+    """The MR source's normalize rules from sources.json (93k -> 93000)"""
+    return registry().normalize(SOURCE, transcript)
 
-def analyze_transcript(title, transcript, duration_minutes):
+def analyze_transcript(title, transcript, duration_minutes, cues=None):
     api_key = open(os.path.expanduser('~/.config/trading-ai/.env')).read().split('=')[1].strip()
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
     
     print("Normalizing price abbreviations...")
     normalized_transcript = normalize_prices_in_transcript(transcript)
@@ -90,8 +51,15 @@ def analyze_transcript(title, transcript, duration_minutes):
         print("  ✓ Expanded K abbreviations")
     
     total_chars = len(normalized_transcript)
-    
-    if total_chars > 30000:
+    # With cue timings we can cut on caption boundaries and pick price-heavy windows
+    index = TranscriptIndex(cues, normalize=normalize_prices_in_transcript) if cues else None
+    
+    if total_chars > 30000 and index:
+        print(f"Long video ({duration_minutes} min). Sampling densest price-talk windows...")
+        windows = index.densest_windows(8000, 5)
+        print("  Windows at " + (", ".join(f"{index.time_at(start) / 60:.0f} min" for start, _ in windows) or "none"))
+        chunks = [index.text[start:end] for start, end in windows] or index.densest_chunks(8000, 1)
+    elif total_chars > 30000:
         print(f"Long video ({duration_minutes} min). Sampling segments...")
         segment_size = total_chars // 5
         chunks = [
@@ -101,19 +69,18 @@ def analyze_transcript(title, transcript, duration_minutes):
             normalized_transcript[segment_size*3:segment_size*3+8000],
             normalized_transcript[-8000:]
         ]
+    elif index:
+        chunks = index.chunks(8000)[:4]
     else:
         chunk_size = 8000
         chunks = [normalized_transcript[i:i+chunk_size] for i in range(0, len(normalized_transcript), chunk_size)][:4]
     
-    print(f"Processing {len(chunks)} segments...")
+    print(f"Processing {len(chunks)} segments in parallel...")
     
-    all_analysis = []
-    
-    for i, chunk in enumerate(chunks):
-        print(f"  Segment {i+1}/{len(chunks)}...")
-        response = client.chat.completions.create(
-            model='gpt-4o-mini',
-            messages=[{'role': 'user', 'content': f'''Analyze this crypto video transcript segment. Extract:
+    def analyze_segment(i, chunk):
+        analysis = complete(
+            client,
+            f'''Analyze this crypto video transcript segment. Extract:
 
 CHART PATTERNS (Classic Technical Analysis):
 - Cup & Handle, Head & Shoulders, Double Top/Bottom, Triangle (Ascending/Descending/Symmetrical), Wedge, Flag, Pennant, Channel, Range/Balance
@@ -130,16 +97,22 @@ For each asset (BTC, ETH, altcoins), note:
 - Bias (bullish/bearish/neutral)
 
 Segment {i+1}:
-{chunk}'''}],
+{chunk}''',
             max_tokens=1200
         )
-        all_analysis.append(response.choices[0].message.content)
+        print(f"  ✓ Segment {i+1}/{len(chunks)}")
+        return analysis
+    
+    # Map: every segment at once (llm caps in-flight calls and retries 429s)
+    with ThreadPoolExecutor(max_workers=len(chunks) or 1) as pool:
+        all_analysis = list(pool.map(analyze_segment, range(len(chunks)), chunks))
     
+    # Reduce
     print("Creating final technical analysis...")
     
-    final = client.chat.completions.create(
-        model='gpt-4o-mini',
-        messages=[{'role': 'user', 'content': f'''Create comprehensive crypto trading plan with technical analysis.
+    return complete(
+        client,
+        f'''Create comprehensive crypto trading plan with technical analysis.
 
 Segments analyzed:
 {chr(10).join(all_analysis)}
@@ -177,41 +150,68 @@ Levels: Support $XXX / Resistance $XXX
 Critical prices and indicator readings
 
 ⏰ TIMEFRAME
-💡 KEY TAKEAWAY'''}],
+💡 KEY TAKEAWAY''',
         max_tokens=1500
     )
-    
-    return final.choices[0].message.content
+
+def select_video(source, state):
+    video = get_latest_video(source['channel'], state)
+    if not video:
+        raise Stop('no_new' if state is not None else 'no_video')
+    print(f"\nVideo: {video['title']}")
+    print(f"Duration: ~{video.get('duration', 0) // 60} minutes")
+    print(f"URL: {video['url']}")
+    return video
+
+def join_transcript(cues):
+    transcript = transcript_text(cues)
+    if not transcript:
+        raise Stop('no_transcript')
+    print(f"Transcript: {len(transcript):,} characters")
+    return transcript
+
+def analyze_video(video, transcript, cues):
+    return analyze_transcript(video['title'], transcript, video.get('duration', 0) // 60, cues)
+
+def mark_seen(analysis, video, state, source):
+    if state is not None:
+        state.mark_seen(source['channel'], [video])
+
+def crypto_pipeline(deadline=None):
+    """Run inputs: state (ChannelState or None), source (source_registry entry)"""
+    return Pipeline([
+        Stage('video', select_video, after=('source', 'state')),
+        Stage('cues', lambda video: get_transcript_cues(video['url']), after=('video',)),
+        Stage('transcript', join_transcript, after=('cues',)),
+        Stage('analysis', analyze_video, after=('video', 'transcript', 'cues')),
+        Stage('seen', mark_seen, after=('analysis', 'video', 'state', 'source')),
+    ], deadline=deadline)
 
 if __name__ == '__main__':
+    # --new-only: skip videos already briefed (see channel_watch.py)
+    state = ChannelState() if '--new-only' in sys.argv else None
+    
     print("="*60)
     print("MITCH RAY CRYPTO BRIEFING")
     print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M PT')}")
     print("="*60)
     
-    video = get_latest_video("https://www.youtube.com/@MitchRayTA/videos")
+    result = crypto_pipeline().run(state=state, source=registry().source(SOURCE))
     
-    if not video:
+    if result.status == 'no_new':
+        print("No new uploads")
+        sys.exit(0)
+    if result.status == 'no_video':
         print("ERROR: Could not fetch video")
         sys.exit(1)
-    
-    duration_min = video.get('duration', 0) // 60
-    print(f"\nVideo: {video['title']}")
-    print(f"Duration: ~{duration_min} minutes")
-    print(f"URL: {video['url']}")
-    
-    transcript = get_transcript(video['url'])
-    
-    if not transcript:
+    if result.status == 'no_transcript':
         print("ERROR: No transcript available")
         sys.exit(1)
-    
-    print(f"Transcript: {len(transcript):,} characters")
-    
-    analysis = analyze_transcript(video['title'], transcript, duration_min)
+    if 'analysis' not in result.values:
+        sys.exit(1)
     
     print("\n" + "="*60)
     print("CRYPTO TRADING PLAN")
     print("="*60)
-    print(analysis)
+    print(result['analysis'])
     print("="*60)
@@ -0,0 +1,7 @@
+"""Filesystem locations shared by the briefing scripts"""
+import os
+
+HOME_DIR = os.path.expanduser('~')
+CONFIG_DIR = os.path.join(HOME_DIR, '.config', 'trading-ai')
+WORK_DIR = os.path.join(HOME_DIR, 'trading-ai')
+CACHE_DIR = os.environ.get('TRADING_AI_CACHE') or os.path.join(HOME_DIR, '.cache', 'trading-ai')
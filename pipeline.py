@@ -0,0 +1,332 @@
+"""Declarative asyncio runner for the briefing scripts.
+
+A pipeline is an ordered list of Stages. Each stage names the stages (or run
+inputs) it needs in `after`, and is called with their values as keyword
+arguments as soon as they are ready, so stages that don't depend on each
+other overlap:
+
+    Pipeline([
+        Stage('videos', list_videos),
+        Stage('transcript', fetch, after=('videos',), each=True, workers=4),
+        Stage('analysis', analyze, after=('transcript', 'api_key'), each=True, workers=4),
+        Stage('briefing', synthesize, after=('analysis',)),
+        Stage('url', publish, after=('briefing',)),
+        Stage('sent', notify, after=('briefing', 'site_url')),   # runs alongside publish
+    ], deadline=time.monotonic() + 600).run(api_key=key, site_url=url)
+
+An `each` stage maps its function over the items of its first dependency
+with `workers` calls in flight, streaming: items reach it as soon as the
+upstream produces them, through a queue of `queue_size` so a slow stage
+holds back the one feeding it. Stages that depend on an `each` stage get its
+results as a list in input order; failed items are dropped.
+
+Blocking functions run on daemon threads, coroutine functions on the loop.
+A stage that raises is recorded in result.errors and the stages that depend
+on it are skipped (with a checkpoint, completed stages are saved so a later
+run can pick up where this one stopped); raising Stop(status) ends the whole run. At the deadline
+every unfinished stage is cancelled (threads already running are abandoned,
+not interrupted; they are daemon threads, so a call stuck in yt-dlp or an
+HTTP request does not keep the process alive once the script is done) and
+the run's status is 'deadline'. A stage's own cutoff is
+softer: an each stage that reaches it keeps its partial results, so the rest
+of the pipeline can still ship something.
+"""
+import asyncio
+import inspect
+import threading
+import time
+from functools import partial
+
+import metrics
+
+QUEUE_SIZE = 8
+MISSING = object()  # value of a stage that failed, was skipped or cancelled
+_DONE = object()    # end of an each stage's input
+
+
+def _in_thread(fn, *args):
+    """Run fn(*args) on a daemon thread; returns an asyncio future for its result
+
+    Unlike a ThreadPoolExecutor, whose threads are joined at interpreter exit,
+    an abandoned call here never delays the exit.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(ok, value):
+        if not future.done():
+            future.set_result(value) if ok else future.set_exception(value)
+
+    def run():
+        try:
+            result = (True, fn(*args))
+        except BaseException as e:
+            result = (False, e)
+        try:
+            loop.call_soon_threadsafe(settle, *result)
+        except RuntimeError:  # loop closed: the run is over and nobody is waiting
+            pass
+
+    threading.Thread(target=run, name='stage', daemon=True).start()
+    return future
+
+
+class Stop(Exception):
+    """Raised by a stage to end the run early with the given status"""
+
+    def __init__(self, status, message=None):
+        super().__init__(message or status)
+        self.status = status
+
+
+class Stage:
+    def __init__(self, name, fn, after=(), each=False, workers=1, timeout=None, cutoff=None, describe=None):
+        """fn(**deps), or fn(item, **other_deps) for an each stage
+
+        timeout bounds each call (each item, for an each stage). cutoff is a
+        time.monotonic() value: calls still running then time out, and an
+        each stage stops taking items and passes on the results it has.
+        describe(item) labels an item in error messages.
+        """
+        self.name = name
+        self.fn = fn
+        self.after = tuple(after)
+        self.each = each
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cutoff = cutoff
+        self.describe = describe
+
+    def __repr__(self):
+        return f'Stage({self.name!r})'
+
+
+class PipelineResult:
+    def __init__(self, values, errors, skipped, status, restored=()):
+        self.values = values    # {stage or input: value}, completed stages only
+        self.errors = errors    # {stage or 'stage[i]': exception}
+        self.skipped = skipped  # stages not run because a dependency had no value
+        self.status = status    # 'ok', a Stop status, or 'deadline'
+        self.restored = list(restored)  # stages loaded from the checkpoint
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+
+class Pipeline:
+    def __init__(self, stages, deadline=None, queue_size=QUEUE_SIZE, checkpoint=None):
+        """stages in dependency order; deadline is a time.monotonic() value
+
+        With a checkpoint.Checkpoint, every completed stage (and each item of
+        an each stage) is saved, and stages already saved are loaded instead
+        of run again.
+        """
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f'duplicate stage {stage.name!r}')
+            if stage.each and not stage.after:
+                raise ValueError(f'each stage {stage.name!r} needs a source in after')
+            self.stages[stage.name] = stage
+        self.deadline = deadline
+        self.queue_size = queue_size
+        self.checkpoint = checkpoint
+        for stage in self.stages.values():
+            if stage.each and any(stage.after[0] in self._ancestors(dep) for dep in stage.after[1:]):
+                # the extra dependency would wait for the source while the source
+                # waits for this stage to drain its queue
+                raise ValueError(f'{stage.name!r}: extra dependencies may not depend on its source')
+
+    def _ancestors(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            return set()
+        out = set(stage.after)
+        for dep in stage.after:
+            out |= self._ancestors(dep)
+        return out
+
+    def run(self, **inputs):
+        return asyncio.run(self.arun(**inputs))
+
+    async def arun(self, **inputs):
+        """Run every stage; inputs are extra values stages can depend on by name"""
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.after if dep not in self.stages and dep not in inputs]
+            if unknown:
+                raise ValueError(f'{stage.name!r} depends on unknown {", ".join(unknown)}')
+        loop = asyncio.get_running_loop()
+        self._values = dict(inputs)
+        self._ready = {name: loop.create_future() for name in self.stages}
+        for name, value in inputs.items():
+            self._ready[name] = loop.create_future()
+            self._ready[name].set_result(value)
+        self._inbox = {name: asyncio.Queue(self.queue_size) for name, s in self.stages.items() if s.each}
+        self._errors = {}
+        self._skipped = []
+        self._restored = []
+        self._status = 'ok'
+        pending = {asyncio.create_task(self._run(stage), name=stage.name) for stage in self.stages.values()}
+        while pending:
+            remaining = None if self.deadline is None else self.deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self._status = 'deadline'
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_EXCEPTION)
+            stop = next((t.exception() for t in done if not t.cancelled() and isinstance(t.exception(), Stop)), None)
+            if stop is not None:
+                self._status = stop.status
+                break
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        values = {name: value for name, value in self._values.items() if value is not MISSING}
+        return PipelineResult(values, self._errors, self._skipped, self._status, self._restored)
+
+    async def _value(self, name):
+        return await asyncio.shield(self._ready[name])
+
+    def _finish(self, name, value):
+        self._values[name] = value
+        if not self._ready[name].done():
+            self._ready[name].set_result(value)
+
+    async def _call(self, stage, *args, **kwargs):
+        if inspect.iscoroutinefunction(stage.fn):
+            call = stage.fn(*args, **kwargs)
+        else:
+            call = _in_thread(partial(stage.fn, *args, **kwargs))
+        timeout = stage.timeout
+        if stage.cutoff is not None:
+            left = max(stage.cutoff - time.monotonic(), 0)
+            timeout = left if timeout is None else min(timeout, left)
+        return await asyncio.wait_for(call, timeout) if timeout is not None else await call
+
+    async def _run(self, stage):
+        try:
+            if stage.each:
+                value = await self._run_each(stage)
+            elif self.checkpoint is not None and self.checkpoint.has(stage.name):
+                value = self.checkpoint.load(stage.name)
+                self._restored.append(stage.name)
+            else:
+                kwargs = {dep: await self._value(dep) for dep in stage.after}
+                if any(v is MISSING for v in kwargs.values()):
+                    self._skipped.append(stage.name)
+                    value = MISSING
+                else:
+                    with metrics.span(f'stage:{stage.name}'):
+                        value = await self._call(stage, **kwargs)
+                    if self.checkpoint is not None:
+                        self.checkpoint.save(stage.name, value)
+        except (Stop, asyncio.CancelledError):
+            self._finish(stage.name, MISSING)
+            raise
+        except Exception as e:
+            print(f'  ⚠️ {stage.name} failed: {type(e).__name__}: {e}')
+            self._errors[stage.name] = e
+            value = MISSING
+        self._finish(stage.name, value)
+
+    def _downstream(self, stage):
+        """Inboxes of the each stages fed item by item from `stage`"""
+        return [self._inbox[s.name] for s in self.stages.values() if s.each and s.after[0] == stage.name]
+
+    async def _run_each(self, stage):
+        source, deps = stage.after[0], stage.after[1:]
+        inbox = self._inbox[stage.name]
+        results = {}
+        restored = set()
+        kwargs = {dep: await self._value(dep) for dep in deps}
+        skip = any(v is MISSING for v in kwargs.values())
+        feeder = None
+        if not (source in self.stages and self.stages[source].each):  # else the source's workers feed us
+            feeder = asyncio.create_task(self._feed(source, inbox))
+        outboxes = self._downstream(stage)
+
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    inbox.put_nowait(_DONE)  # let the other workers see it
+                    return
+                if skip:
+                    continue
+                index, value = item
+                try:
+                    if self.checkpoint is not None and self.checkpoint.has(stage.name, index):
+                        out = self.checkpoint.load(stage.name, index)
+                        restored.add(index)
+                    else:
+                        with metrics.span(f'stage:{stage.name}', item=index):
+                            out = await self._call(stage, value, **kwargs)
+                        if self.checkpoint is not None:
+                            self.checkpoint.save(stage.name, out, index)
+                except (Stop, asyncio.CancelledError):
+                    raise
+                except Exception as e:
+                    label = stage.describe(value) if stage.describe else f'#{index}'
+                    print(f'  ⚠️ {stage.name} {label}: {type(e).__name__}: {e}')
+                    self._errors[f'{stage.name}[{index}]'] = e
+                    continue
+                results[index] = out
+                for outbox in outboxes:
+                    await outbox.put((index, out))  # blocks while downstream is behind
+
+        tasks = [asyncio.create_task(worker()) for _ in range(stage.workers)]
+        try:
+            left = None if stage.cutoff is None else max(stage.cutoff - time.monotonic(), 0)
+            try:
+                await asyncio.wait_for(asyncio.gather(*tasks), left)
+            except asyncio.TimeoutError:
+                print(f'  ⏱ {stage.name}: cut off with {len(results)} result(s)')
+            else:
+                if feeder is not None:
+                    await feeder
+        except Stop:
+            raise
+        except Exception:
+            for outbox in outboxes:  # downstream still has to see the end
+                await outbox.put(_DONE)
+            raise
+        finally:
+            for task in tasks + [feeder]:
+                if task is not None:
+                    task.cancel()  # no-op once finished
+        for outbox in outboxes:
+            await outbox.put(_DONE)
+        if skip or await self._value(source) is MISSING:
+            self._skipped.append(stage.name)
+            return MISSING
+        if restored:
+            self._restored.append(f'{stage.name}[{len(restored)}/{len(results)}]')
+        return [results[i] for i in sorted(results)]
+
+    async def _feed(self, source, inbox):
+        """Put the items of a (non-each) stage's value into an each stage's inbox"""
+        value = await self._value(source)
+        try:
+            if value is MISSING:
+                pass
+            elif hasattr(value, '__aiter__'):
+                index = 0
+                async for item in value:
+                    await inbox.put((index, item))
+                    index += 1
+            else:
+                items = iter(value)
+                index = 0
+                while True:
+                    # generators may block (yt-dlp, HTTP), so pull items off the loop thread
+                    item = await _in_thread(next, items, _DONE)
+                    if item is _DONE:
+                        break
+                    await inbox.put((index, item))
+                    index += 1
+        except Exception:
+            await inbox.put(_DONE)
+            raise
+        await inbox.put(_DONE)
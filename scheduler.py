@@ -0,0 +1,104 @@
+"""Time budget for a briefing that has to be out by a fixed time of day.
+
+The morning run starts early from cron (combined_briefing.py --deadline
+06:30) and works back from the deadline: the publish and Telegram stages get
+a fixed reserve, and everything before them -- transcripts and analysis --
+must finish by what is left. As the deadline gets closer the run degrades
+instead of missing it:
+
+    full     download fresh subtitles and analyze every source
+    cached   no yt-dlp (too little time, or yt-dlp is not installed): only
+             transcripts already in the cache are analyzed
+    cut off  sources still running at the cutoff are dropped and the
+             briefing ships with what finished ("VI ONLY" / "MR ONLY")
+
+The deadline is the occurrence of the clock time nearest to the start (a
+23:00 run for 06:30 plans for tomorrow morning). A run starting up to
+LATE_GRACE after it still ships, late; one starting more than MAX_LATE
+after it is refused with DeadlinePassed rather than cancelled on the spot.
+"""
+import shutil
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import ytdlp_worker
+
+TIMEZONE = ZoneInfo('America/Los_Angeles')
+DEADLINE = '06:30'
+# seconds kept back after the source stages, in pipeline order
+RESERVE = {'render': 15, 'publish': 90, 'notify': 30}
+DOWNLOAD_MIN = 150   # source time below which fresh downloads are not attempted
+LATE_GRACE = 120     # source time allowed when the run starts at or past the deadline
+MAX_LATE = 3600      # seconds past the deadline after which a run is refused
+
+
+class DeadlinePassed(ValueError):
+    pass
+
+
+def deadline_at(clock=DEADLINE, now=None, tz=TIMEZONE):
+    """The occurrence of `clock` ('HH:MM') in tz nearest to now, as an aware datetime"""
+    now = (now or datetime.now(tz)).astimezone(tz)
+    try:
+        hour, minute = map(int, clock.split(':'))
+        deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    except ValueError:
+        raise ValueError(f'deadline must be HH:MM, got {clock!r}') from None
+    if deadline - now > timedelta(hours=12):
+        deadline -= timedelta(days=1)
+    elif now - deadline > timedelta(hours=12):
+        deadline += timedelta(days=1)
+    return deadline
+
+
+def can_download():
+    return shutil.which('yt-dlp') is not None or ytdlp_worker.available()
+
+
+class Budget:
+    """Seconds left before a wall-clock deadline, on the monotonic clock"""
+
+    def __init__(self, deadline, reserve=RESERVE, now=None):
+        self.deadline = deadline
+        self.reserve = dict(reserve)
+        now = now or datetime.now(deadline.tzinfo)
+        self._end = time.monotonic() + (deadline - now).total_seconds()
+
+    def remaining(self, before=()):
+        """Seconds until the deadline, less the reserve of the stages named in `before`"""
+        return self._end - time.monotonic() - sum(self.reserve.get(name, 0) for name in before)
+
+    def cutoff(self, before=()):
+        """time.monotonic() value by which work must stop to leave room for `before`"""
+        return self._end - sum(self.reserve.get(name, 0) for name in before)
+
+    def sources_cutoff(self):
+        """When transcripts and analysis must stop; never less than LATE_GRACE from now"""
+        return max(self.cutoff(self.reserve), time.monotonic() + LATE_GRACE)
+
+    @property
+    def end(self):
+        """time.monotonic() of the deadline itself, pushed back if the run started late"""
+        return max(self._end, self.sources_cutoff() + sum(self.reserve.values()))
+
+    def plan(self, downloads=None):
+        """'full' or 'cached'"""
+        downloads = can_download() if downloads is None else downloads
+        if not downloads or self.sources_cutoff() - time.monotonic() < DOWNLOAD_MIN:
+            return 'cached'
+        return 'full'
+
+    def describe(self):
+        left = self.remaining()
+        when = self.deadline.strftime('%H:%M %Z')
+        return f"{left / 60:.0f} min to {when}" if left > 0 else f"{-left / 60:.0f} min past {when}"
+
+
+def budget(clock=DEADLINE, now=None):
+    """Budget for the next `clock` deadline; DeadlinePassed if it was more than MAX_LATE ago"""
+    deadline = deadline_at(clock, now)
+    late = ((now or datetime.now(deadline.tzinfo)) - deadline).total_seconds()
+    if late > MAX_LATE:
+        raise DeadlinePassed(f"deadline {deadline.strftime('%Y-%m-%d %H:%M %Z')} passed {late / 60:.0f} min ago")
+    return Budget(deadline, now=now)
@@ -1,6 +1,6 @@
 import os
 import sys
-import requests
+import telegram_delivery
 
 def send_message(message):
     with open(os.path.expanduser('~/.config/trading-ai/.env'), 'r') as f:
@@ -19,29 +19,13 @@ def send_message(message):
         print('ERROR: Credentials not found')
         return False
     
-    url = f'https://api.telegram.org/bot{bot_token}/sendMessage'
-    
-    max_length = 4000
-    parts = [message[i:i+max_length] for i in range(0, len(message), max_length)]
-    
-    for i, part in enumerate(parts):
-        payload = {
-            'chat_id': chat_id,
-            'text': part,
-            'parse_mode': 'Markdown',
-            'disable_web_page_preview': True
-        }
-        
-        try:
-            response = requests.post(url, json=payload, timeout=30)
-            if response.status_code != 200:
-                print(f'Error: {response.text}')
-                return False
-        except Exception as e:
-            print(f'Error: {e}')
-            return False
-    
-    return True
+    results = telegram_delivery.deliver(bot_token, telegram_delivery.parse_chat_ids(chat_id), message)
+    ok = True
+    for chat, result in results.items():
+        for part, error in result['failed']:
+            print(f'Error: chat {chat} part {part + 1}: {error}')
+            ok = False
+    return ok
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
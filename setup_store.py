@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Append-only history of every extracted setup.
+
+Each run records its briefing_parser.Setup objects, with the source label
+and video they came from, in ~/trading-ai/setups.sqlite3. Rows are never
+updated or deleted (triggers refuse it), and (ticker, recorded_at) and
+(kind, recorded_at) indexes keep questions like "all NVDA setups in the last
+90 days" or "BTC support levels this month" to a range scan.
+
+Usage: python3 setup_store.py [TICKER] [--days N] [--kind equity|crypto]
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from paths import WORK_DIR
+
+STORE_PATH = os.path.join(WORK_DIR, 'setups.sqlite3')
+LEVEL_FIELDS = ('entry', 'stop', 'target', 'support', 'resist')
+COLUMNS = ('id', 'recorded_at', 'ticker', 'kind') + LEVEL_FIELDS + ('bias', 'source', 'video_url')
+
+
+class SetupStore:
+    """SQLite-backed, append-only setup log"""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS setups (
+                    id INTEGER PRIMARY KEY,
+                    recorded_at REAL NOT NULL,
+                    ticker TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    entry REAL, stop REAL, target REAL, support REAL, resist REAL,
+                    bias TEXT,
+                    source TEXT,
+                    video_url TEXT)''')
+                conn.execute('CREATE INDEX IF NOT EXISTS setups_ticker ON setups(ticker, recorded_at)')
+                conn.execute('CREATE INDEX IF NOT EXISTS setups_kind ON setups(kind, recorded_at)')
+                conn.execute('CREATE INDEX IF NOT EXISTS setups_time ON setups(recorded_at)')
+                for action in ('UPDATE', 'DELETE'):
+                    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS setups_no_{action.lower()}
+                        BEFORE {action} ON setups BEGIN SELECT RAISE(ABORT, 'setups is append-only'); END''')
+            self._ready = True
+        return conn
+
+    def record(self, setups, source=None, video_url=None, recorded_at=None):
+        """Append Setup objects; source defaults to each setup's own VI:/MR: prefix"""
+        recorded_at = recorded_at or time.time()
+        rows = [(recorded_at, s.ticker, s.kind, s.entry, s.stop, s.target, s.support, s.resist,
+                 s.bias, source or s.source, video_url) for s in setups]
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(f'INSERT INTO setups ({", ".join(COLUMNS[1:])}) VALUES '
+                                     f'({", ".join("?" * (len(COLUMNS) - 1))})', rows)
+            finally:
+                conn.close()
+        return len(rows)
+
+    def query(self, ticker=None, kind=None, source=None, since=None, until=None, limit=None):
+        """Matching setups as dicts, newest first; since/until are unix timestamps"""
+        where, params = [], []
+        for column, value in (('ticker', ticker and ticker.upper()), ('kind', kind), ('source', source)):
+            if value is not None:
+                where.append(f'{column} = ?')
+                params.append(value)
+        if since is not None:
+            where.append('recorded_at >= ?')
+            params.append(since)
+        if until is not None:
+            where.append('recorded_at < ?')
+            params.append(until)
+        sql = 'SELECT * FROM setups' + (' WHERE ' + ' AND '.join(where) if where else '')
+        sql += ' ORDER BY recorded_at DESC, id DESC'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        with self._lock:
+            conn = self._connect()
+            try:
+                return [dict(row) for row in conn.execute(sql, params)]
+            finally:
+                conn.close()
+
+    def levels(self, ticker, field, since=None, until=None):
+        """[(recorded_at, value)] of one level, e.g. levels('BTC', 'support', month_start())"""
+        if field not in LEVEL_FIELDS:
+            raise ValueError(f'unknown level {field!r}')
+        return [(row['recorded_at'], row[field]) for row in self.query(ticker, since=since, until=until)
+                if row[field] is not None]
+
+    def latest(self, ticker):
+        rows = self.query(ticker, limit=1)
+        return rows[0] if rows else None
+
+
+def days_ago(days, now=None):
+    return (now or time.time()) - days * 86400
+
+
+def month_start(now=None):
+    t = time.localtime(now)
+    return time.mktime((t.tm_year, t.tm_mon, 1, 0, 0, 0, 0, 0, -1))
+
+
+setup_store = SetupStore()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    opts = {}
+    for flag in ('--days', '--kind'):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    since = days_ago(float(opts['--days'])) if '--days' in opts else None
+    for row in setup_store.query(args[0] if args else None, kind=opts.get('--kind'), since=since):
+        row['recorded_at'] = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['recorded_at']))
+        print(json.dumps(row))
@@ -0,0 +1,111 @@
+"""Which channels the briefings read, and how each one is handled.
+
+sources.json (next to this file, or ~/.config/trading-ai/sources.json, or
+$TRADING_AI_SOURCES) lists prompt profiles and sources. A source is:
+
+    label          prefix in the combined text ("VI: ...") and setup store
+    channel        channel /videos URL
+    videos         pinned video URLs; when empty, the newest `latest` uploads
+                   of the channel whose titles match title_filters are used
+    title_filters  substrings, any of which a title must contain (none: any)
+    profile        name of the prompt profile used to analyze it
+    normalize      transcript rewrites before analysis, in combined_briefing
+                   and the source's own script: built-in rule names
+                   ("k_suffix": 93k -> 93000) or {"pattern", "replace"} regexes
+    priority       lower is listed and fetched first, so with few workers or a
+                   tight deadline its videos are started first
+
+A profile is {"prompt", "max_tokens", "transcript_tokens"}.
+"""
+import json
+import os
+import re
+
+from paths import CONFIG_DIR
+
+SOURCES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sources.json')
+USER_SOURCES_PATH = os.path.join(CONFIG_DIR, 'sources.json')
+REGISTRY_VERSION = 1
+DEFAULTS = {'channel': None, 'videos': [], 'title_filters': [], 'normalize': [], 'priority': 100, 'latest': 1}
+
+
+def _expand_k(match):
+    number = match.group(1)
+    return str(int(float(number) * 1000)) if '.' in number else str(int(number) * 1000)
+
+
+K_SUFFIX_RE = re.compile(r'(\d+\.?\d*)\s*[Kk]\b')
+RULES = {
+    'k_suffix': lambda text: K_SUFFIX_RE.sub(_expand_k, text),
+}
+
+
+def _compile_rule(rule):
+    if isinstance(rule, str):
+        if rule not in RULES:
+            raise ValueError(f'unknown normalize rule {rule!r}')
+        return RULES[rule]
+    pattern = re.compile(rule['pattern'], re.IGNORECASE if rule.get('ignore_case') else 0)
+    return lambda text: pattern.sub(rule['replace'], text)
+
+
+def default_path():
+    return os.environ.get('TRADING_AI_SOURCES') or (
+        USER_SOURCES_PATH if os.path.exists(USER_SOURCES_PATH) else SOURCES_PATH)
+
+
+class Registry:
+    def __init__(self, profiles, sources):
+        self.profiles = profiles
+        self.sources = []
+        labels = set()
+        for entry in sources:
+            source = dict(DEFAULTS, **entry)
+            label = source.get('label')
+            if not label or label in labels:
+                raise ValueError(f'source label missing or duplicated: {label!r}')
+            if source.get('profile') not in profiles:
+                raise ValueError(f'{label}: unknown profile {source.get("profile")!r}')
+            if not source['channel'] and not source['videos']:
+                raise ValueError(f'{label}: needs a channel or videos')
+            labels.add(label)
+            self.sources.append(source)
+        self.sources.sort(key=lambda s: s['priority'])  # stable: file order breaks ties
+        self._by_label = {s['label']: s for s in self.sources}
+        self._rules = {s['label']: [_compile_rule(r) for r in s['normalize']] for s in self.sources}
+
+    @classmethod
+    def load(cls, path=None):
+        with open(path or default_path(), encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version', REGISTRY_VERSION) != REGISTRY_VERSION:
+            raise ValueError(f"unsupported sources.json version {data['version']}")
+        return cls(data.get('profiles', {}), data.get('sources', []))
+
+    def source(self, label):
+        return self._by_label[label]
+
+    def profile(self, name):
+        return self.profiles[name]
+
+    def normalize(self, label, text):
+        for rule in self._rules.get(label, ()):
+            text = rule(text)
+        return text
+
+
+def matches(source, title):
+    """Whether a video title passes the source's title filters"""
+    filters = source['title_filters']
+    return not filters or any(f.lower() in title.lower() for f in filters)
+
+
+_registry = None
+
+
+def registry():
+    """The default registry, loaded on first use"""
+    global _registry
+    if _registry is None:
+        _registry = Registry.load()
+    return _registry
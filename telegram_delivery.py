@@ -0,0 +1,212 @@
+"""Telegram delivery: entity-safe splitting and concurrent, ordered fan-out.
+
+split_message() cuts long text at paragraph, line or word boundaries and
+never inside a Markdown entity or HTML tag; HTML tags left open at a cut are
+closed and reopened in the next part, Markdown code blocks likewise.
+
+deliver() sends the parts to any number of chats at once. Within a chat the
+parts go out strictly in order; across chats they are concurrent, under a
+shared messages-per-second budget. 429 replies are retried after the
+retry_after Telegram asks for, a part Telegram cannot parse is resent as
+plain text, and one failed part does not stop the parts after it.
+"""
+import asyncio
+import re
+import time
+
+import http_client
+import metrics
+
+MAX_LENGTH = 4000          # Telegram's hard limit is 4096
+MAX_CONCURRENT_CHATS = 8
+MESSAGES_PER_SECOND = 25   # Telegram allows ~30/s per bot overall
+MAX_RETRIES = 5
+
+HTML_TAG_RE = re.compile(r'<(/?)([a-zA-Z][\w-]*)[^>]*>')
+
+
+def _break_point(text, limit):
+    """Best cut <= limit: paragraph, then line, then word boundary"""
+    if len(text) <= limit:
+        return len(text)
+    for sep in ('\n\n', '\n', ' '):
+        i = text.rfind(sep, 0, limit)
+        if i > limit // 4:
+            return i + len(sep)
+    return limit
+
+
+def _open_markdown(chunk):
+    """(index, marker) of the first entity left open in chunk, or (-1, None)"""
+    opened = {}
+    i = 0
+    while i < len(chunk):
+        if chunk.startswith('```', i):
+            if '```' in opened:
+                del opened['```']
+            else:
+                opened['```'] = i
+            i += 3
+            continue
+        c = chunk[i]
+        if '```' in opened or ('`' in opened and c != '`'):
+            i += 1
+            continue
+        if c in '*_`':
+            if c in opened:
+                del opened[c]
+            else:
+                opened[c] = i
+        elif c == '[' and '[' not in opened:
+            opened['['] = i
+        elif c == ')' and '[' in opened and '](' in chunk[opened['[']:i]:
+            del opened['[']
+        i += 1
+    if not opened:
+        return -1, None
+    marker = min(opened, key=opened.get)
+    return opened[marker], marker
+
+
+def _open_html(chunk):
+    stack = []
+    for m in HTML_TAG_RE.finditer(chunk):
+        if m.group(1):
+            if stack and stack[-1][0] == m.group(2).lower():
+                stack.pop()
+        else:
+            stack.append((m.group(2).lower(), m.group(0)))
+    return stack
+
+
+def split_message(text, limit=MAX_LENGTH, parse_mode='Markdown'):
+    """List of (part, parse_mode) no longer than limit
+
+    A part whose entities cannot be kept intact is sent with parse_mode None.
+    """
+    parts = []
+    rest = text
+    while rest:
+        cut = _break_point(rest, limit)
+        chunk, mode = rest[:cut], parse_mode
+        carry = ''
+        if parse_mode == 'HTML' and cut < len(rest):
+            lt, gt = chunk.rfind('<'), chunk.rfind('>')
+            amp, semi = chunk.rfind('&'), chunk.rfind(';')
+            back = max(lt if lt > gt else -1, amp if amp > semi and cut - amp < 10 else -1)
+            if back > 0:  # don't cut through a tag or an &entity;
+                cut, chunk = back, rest[:back]
+            stack = _open_html(chunk)
+            closing = ''.join(f'</{name}>' for name, _ in reversed(stack))
+            carry = ''.join(tag for _, tag in stack)
+            if len(chunk) + len(closing) > limit:
+                cut = _break_point(rest, limit - len(closing))
+                chunk = rest[:cut]
+                stack = _open_html(chunk)
+                closing = ''.join(f'</{name}>' for name, _ in reversed(stack))
+                carry = ''.join(tag for _, tag in stack)
+            chunk += closing
+        elif parse_mode == 'Markdown' and cut < len(rest):
+            pos, marker = _open_markdown(chunk)
+            if pos > 0:
+                back = max(chunk.rfind('\n', 0, pos), chunk.rfind(' ', 0, pos))
+                if back > 0:
+                    cut, chunk = back + 1, rest[:back + 1]
+                    pos = -1
+            if pos >= 0 and marker == '```':
+                cut = _break_point(rest, limit - 4)
+                chunk, carry = rest[:cut] + '\n```', '```\n'
+            elif pos >= 0:
+                mode = None  # single entity longer than a message: send it plain
+        parts.append((chunk.strip('\n') if mode == parse_mode else chunk, mode))
+        rest = carry + rest[cut:].lstrip('\n') if rest[cut:].strip() else ''
+    return [(p, m) for p, m in parts if p.strip()]
+
+
+class RateLimiter:
+    """Spaces out calls to at most `rate` per second across all tasks"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _send_part(url, payload, limiter, result):
+    """POST one message; returns (ok, description)"""
+    for attempt in range(MAX_RETRIES):
+        if attempt:
+            result['retries'] += 1
+        await limiter.wait()
+        try:
+            response = await http_client.arequest('POST', url, json=payload)
+            body = response.json()
+        except Exception as e:
+            return False, str(e)
+        if body.get('ok'):
+            return True, None
+        retry_after = (body.get('parameters') or {}).get('retry_after')
+        if response.status_code == 429 and retry_after:
+            await asyncio.sleep(float(retry_after))
+            continue
+        if response.status_code == 400 and payload.get('parse_mode') and 'parse' in body.get('description', ''):
+            payload = {k: v for k, v in payload.items() if k != 'parse_mode'}
+            continue
+        return False, body.get('description', f'HTTP {response.status_code}')
+    return False, 'too many retries'
+
+
+async def _deliver_chat(url, chat_id, parts, extra, limiter, slots):
+    async with slots:
+        result = {'sent': 0, 'failed': [], 'retries': 0}
+        for i, (text, mode) in enumerate(parts):
+            payload = {'chat_id': chat_id, 'text': text, 'disable_web_page_preview': True}
+            if mode:
+                payload['parse_mode'] = mode
+            if i == len(parts) - 1:
+                payload.update(extra)
+            ok, error = await _send_part(url, payload, limiter, result)
+            if ok:
+                result['sent'] += 1
+            else:
+                result['failed'].append((i, error))
+        return result
+
+
+async def adeliver(bot_token, chat_ids, text, parse_mode='Markdown', reply_markup=None,
+                   max_concurrent_chats=MAX_CONCURRENT_CHATS, rate=MESSAGES_PER_SECOND):
+    """Send text to every chat; returns {chat_id: {'sent': n, 'failed': [(part, error)], 'retries': n}}"""
+    url = f'https://api.telegram.org/bot{bot_token}/sendMessage'
+    parts = split_message(text, parse_mode=parse_mode)
+    extra = {'reply_markup': reply_markup} if reply_markup else {}
+    limiter = RateLimiter(rate)
+    slots = asyncio.Semaphore(max_concurrent_chats)
+    with metrics.span('telegram', chats=len(chat_ids), parts=len(parts)) as span:
+        results = await asyncio.gather(*[_deliver_chat(url, chat_id, parts, extra, limiter, slots)
+                                         for chat_id in chat_ids])
+        span.add(bytes=len(text.encode()) * len(chat_ids), retries=sum(r['retries'] for r in results))
+        span.set(failed=sum(len(r['failed']) for r in results))
+    return dict(zip(chat_ids, results))
+
+
+def deliver(bot_token, chat_ids, text, **kwargs):
+    """Blocking wrapper around adeliver()"""
+    async def run():
+        try:
+            return await adeliver(bot_token, chat_ids, text, **kwargs)
+        finally:
+            await http_client.aclose()
+    return asyncio.run(run())
+
+
+def parse_chat_ids(value):
+    """'123, -456' -> ['123', '-456']"""
+    return [c.strip() for c in (value or '').split(',') if c.strip()]
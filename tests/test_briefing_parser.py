@@ -0,0 +1,31 @@
+import os
+
+from briefing_parser import extract_setups
+
+BRIEFING_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'latest_briefing.txt')
+
+EXPECTED = [  # ticker, kind, entry, stop, target, support, resist, bias
+    ('SPX', 'equity', 7000, 6950, 6800, None, None, 'Bearish'),
+    ('NASDAQ', 'equity', 24500, 24400, 26600, None, None, 'Bullish'),
+    ('SMH', 'equity', 50, 52, 45, None, None, 'Bearish'),
+    ('DJT', 'equity', 20500, 20300, 20550, None, None, 'Bullish'),
+    ('OCL', 'equity', 172.8, None, 140.72, None, None, 'Bearish'),
+    ('LIT', 'equity', 625.27, 646.44, None, None, None, 'Bearish'),
+    ('BTC', 'crypto', None, 1026, None, 90000, 110000, 'Neutral'),  # stop from "lower than $1,026"
+    ('ETH', 'crypto', None, None, None, 2000, 3000, 'Bullish'),
+]
+
+
+def test_latest_briefing():
+    with open(BRIEFING_PATH) as f:
+        setups = extract_setups(f.read())
+    assert [(s.ticker, s.kind, s.entry, s.stop, s.target, s.support, s.resist, s.bias)
+            for s in setups] == EXPECTED
+    assert all(s.source is None for s in setups)
+
+
+def test_source_prefix_is_matched_literally():
+    [nvda] = extract_setups('A+B: NVDA - entry 100 stop 90 target 120', sources=('A+B',))
+    assert (nvda.source, nvda.entry, nvda.stop, nvda.target) == ('A+B', 100, 90, 120)
+    [other] = extract_setups('AAB: TSLA - entry 200 stop 190 target 220', sources=('A+B',))
+    assert other.source is None  # 'A+B' unescaped would match 'AAB'
@@ -0,0 +1,48 @@
+import os
+
+import checkpoint
+import combined_briefing
+from pipeline import Pipeline
+
+BRIEFING = ('VI: AAPL long', {'equities': []})
+INPUTS = dict(briefing=BRIEFING, dashboard_url='https://example.github.io/dash/', bot_token='token', chat_id='1')
+
+
+def sent_pipeline(run):
+    """The briefing pipeline's own 'sent' stage, fed its inputs directly"""
+    return Pipeline([combined_briefing.briefing_pipeline(checkpoint=run).stages['sent']], checkpoint=run)
+
+
+def test_failed_delivery_is_not_checkpointed(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(combined_briefing, 'send_telegram', lambda *args: calls.append(args) or False)
+    run = checkpoint.Checkpoint('run', root=str(tmp_path))
+    run.save('sources', [])  # as run_briefing does before the pipeline starts
+    result = sent_pipeline(run).run(**INPUTS)
+    assert 'sent' in result.errors
+    assert not run.has('sent')
+
+    monkeypatch.setattr(combined_briefing, 'send_telegram', lambda *args: calls.append(args) or True)
+    run = checkpoint.Checkpoint.resume('run', root=str(tmp_path))
+    result = sent_pipeline(run).run(**INPUTS)
+    assert result['sent'] == 'sent'
+    assert result.restored == []
+    assert len(calls) == 2
+    assert run.load('sent') == 'sent'
+
+
+def test_delivered_reports_partial_success():
+    assert combined_briefing.delivered({'1': {'sent': 1, 'failed': [], 'retries': 0},
+                                        '2': {'sent': 0, 'failed': [(0, 'Forbidden')], 'retries': 0}})
+    assert not combined_briefing.delivered({'1': {'sent': 0, 'failed': [(0, 'Forbidden')], 'retries': 0}})
+
+
+def test_unconfigured_telegram_is_recorded_as_skipped(tmp_path):
+    run = checkpoint.Checkpoint('run', root=str(tmp_path))
+    result = sent_pipeline(run).run(**dict(INPUTS, bot_token=None))
+    assert result['sent'] == 'skipped'
+    assert run.load('sent') == 'skipped'
+
+
+def test_run_id_includes_pid():
+    assert checkpoint.Checkpoint().run_id.endswith(f'-{os.getpid()}')
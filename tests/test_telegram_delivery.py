@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+from telegram_delivery import RateLimiter, split_message
+
+
+def test_short_text_is_one_part():
+    assert split_message('hello *world*', limit=50) == [('hello *world*', 'Markdown')]
+
+
+def test_parts_stay_within_limit():
+    text = '\n\n'.join(f'paragraph {i} ' + 'word ' * 30 for i in range(20))
+    parts = split_message(text, limit=200)
+    assert len(parts) > 1
+    assert all(len(part) <= 200 for part, _ in parts)
+    assert ' '.join(' '.join(part.split()) for part, _ in parts) == ' '.join(text.split())
+
+
+def test_html_tag_open_at_cut_is_closed_and_reopened():
+    text = 'intro ' + '<b>' + 'bold words ' * 20 + '</b> tail'
+    parts = split_message(text, limit=100, parse_mode='HTML')
+    assert len(parts) > 1
+    assert all(len(part) <= 100 and mode == 'HTML' for part, mode in parts)
+    first, second = parts[0][0], parts[1][0]
+    assert first.endswith('</b>')
+    assert second.startswith('<b>')
+
+
+def test_html_cut_never_splits_a_tag_or_entity():
+    text = 'x' * 95 + ' <a href="https://example.com/long">link</a> &amp; more'
+    for part, _ in split_message(text, limit=100, parse_mode='HTML'):
+        assert part.count('<') == part.count('>')
+        assert '&amp' not in part or '&amp;' in part
+
+
+def test_markdown_code_block_is_closed_and_reopened():
+    text = 'Levels:\n```\n' + '\n'.join(f'SPX {7000 + i}' for i in range(40)) + '\n```'
+    parts = split_message(text, limit=120)
+    assert len(parts) > 1
+    assert all(len(part) <= 120 and mode == 'Markdown' for part, mode in parts)
+    assert parts[0][0] == 'Levels:'  # cut before the block rather than inside it
+    assert all(part.startswith('```\n') and part.endswith('\n```') for part, _ in parts[1:])
+    assert all(part.count('```') % 2 == 0 for part, _ in parts)
+
+
+def test_markdown_entity_longer_than_a_part_is_sent_plain():
+    text = '*' + 'bold ' * 40 + '* after'
+    parts = split_message(text, limit=100)
+    assert parts[0][1] is None
+    assert all(len(part) <= 100 for part, _ in parts)
+
+
+def test_rate_limiter_spaces_calls():
+    async def calls():
+        limiter = RateLimiter(20)
+        stamps = []
+        for _ in range(5):
+            await limiter.wait()
+            stamps.append(time.monotonic())
+        return stamps
+
+    stamps = asyncio.run(calls())
+    assert all(b - a >= 0.05 * 0.9 for a, b in zip(stamps, stamps[1:]))
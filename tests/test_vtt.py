@@ -0,0 +1,61 @@
+from vtt import Cue, clean_text, iter_captions, iter_cues, parse_timestamp, transcript_text
+
+# Auto-generated captions as YouTube serves them: each cue repeats the previous
+# line before adding a new one, and the first copy carries word timings.
+ROLLING = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:03.077 align:start position:0%
+
+I<00:00:00.385><c> would</c><00:00:00.769><c> not</c><00:00:01.154><c> chase</c>
+
+00:00:03.077 --> 00:00:03.087 align:start position:0%
+I would not chase
+
+
+00:00:03.087 --> 00:00:06.164 align:start position:0%
+I would not chase
+the<00:00:03.472><c> retest</c><00:00:03.856><c> &amp;</c><00:00:04.241><c> confirm</c>
+
+00:00:06.164 --> 00:00:06.174 align:start position:0%
+the retest & confirm
+
+""".splitlines(keepends=True)
+
+
+def test_parse_timestamp():
+    assert parse_timestamp('01:02:03.450') == 3723.45
+    assert parse_timestamp('02:03,450') == 123.45
+
+
+def test_clean_text_strips_tags_and_entities():
+    assert clean_text('the<00:00:03.472><c> retest</c> &amp;  more ') == 'the retest & more'
+
+
+def test_rolling_captions_are_deduplicated():
+    cues = list(iter_captions(ROLLING))
+    assert cues == [Cue(0.0, 3.077, 'I would not chase'),
+                    Cue(3.087, 6.164, 'the retest & confirm')]
+    assert transcript_text(cues) == 'I would not chase the retest & confirm'
+
+
+def test_iter_cues_keeps_repeats():
+    assert [cue.text for cue in iter_cues(ROLLING)] == [
+        'I would not chase', 'I would not chase', 'I would not chase',
+        'the retest & confirm', 'the retest & confirm']
+
+
+def test_identifiers_and_notes_are_skipped():
+    text = ['WEBVTT\n', '\n', 'NOTE written by hand\n', 'still a note\n', '\n',
+            'cue-1\n', '00:01.000 --> 00:02.000\n', 'hello\n', '\n',
+            '00:02.000 --> 00:03.000\n', 'world\n']
+    assert list(iter_cues(text)) == [Cue(1.0, 2.0, 'hello'), Cue(2.0, 3.0, 'world')]
+
+
+def test_repeat_outside_window_is_kept():
+    lines = []
+    for i, word in enumerate(['alpha', 'beta', 'gamma', 'alpha']):
+        lines += [f'00:0{i}.000 --> 00:0{i + 1}.000\n', f'{word}\n', '\n']
+    assert [cue.text for cue in iter_captions(lines, window=2)] == ['alpha', 'beta', 'gamma', 'alpha']
+    assert [cue.text for cue in iter_captions(lines, window=3)] == ['alpha', 'beta', 'gamma']
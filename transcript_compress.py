@@ -0,0 +1,143 @@
+"""Fit a whole transcript into a token budget before it goes to the LLM.
+
+Instead of cutting a transcript to its first N characters, compress() splits
+it into sentences, strips filler ("um", "you know", "[Music]") and stuttered
+repeats, drops sentences already said, then keeps the sentences that matter
+most -- those with prices, tickers and chart/pattern vocabulary -- in their
+original order until the budget is full. Token counts are exact with tiktoken
+(pip install tiktoken); without it they are a conservative estimate that
+rounds up, and a warning says so once per run.
+
+    text = compress(transcript, budget=3000)
+"""
+import re
+from functools import lru_cache
+
+import metrics
+from llm import DEFAULT_MODEL
+from transcript_index import NOT_TICKERS, PRICE_RE, SPOKEN_RE, TICKER_RE
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_BUDGET = 3000
+MAX_SENTENCE_WORDS = 30  # auto-captions have no punctuation; cut run-ons here
+GAP = ' ...'             # marks skipped text between kept sentences
+
+FILLER_RE = re.compile(
+    r'\[(?:music|applause|laughter|inaudible)\]'
+    r'|\b(?:u+m+|u+h+|uh-huh|erm|hmm+|you know|i mean|you guys know|kind of|sort of|basically|literally)\b,?',
+    re.IGNORECASE)
+# "I think I think", "the the the": a 1-4 word phrase repeated back to back
+STUTTER_RE = re.compile(r"\b([\w']+(?:\s+[\w']+){0,3})(?:\s+\1\b)+", re.IGNORECASE)
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+SPACE_RE = re.compile(r'\s+')
+VOCABULARY_RE = re.compile(
+    r'\b(?:support|resistance|breakout|breakdown|entry|stop|target|long|short|bullish|bearish'
+    r'|trend ?line|channel|range|wedge|flag|pennant|triangle|cup and handle|head and shoulders'
+    r'|double (?:top|bottom)|neckline|retest|fib\w*|golden pocket|liquidity|gap'
+    r'|rsi|macd|vwap|ema|sma|moving average|volume|divergence|doji|hammer|engulfing)\b',
+    re.IGNORECASE)
+# Fallback tokenizer: digits in runs of up to 3, letters in pieces of up to 6,
+# each other symbol on its own -- at or above what BPE tokenizers produce
+ESTIMATE_RE = re.compile(r'\d{1,3}|[^\W\d_]{1,6}|[^\s\w]|_')
+
+PRICE_WEIGHT = 3
+TICKER_WEIGHT = 2
+VOCABULARY_WEIGHT = 1
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('o200k_base')
+
+
+@lru_cache(maxsize=None)
+def _warn_estimate():
+    print('  ⚠️ tiktoken not installed: token budgets use an estimate (pip install tiktoken for exact counts)')
+
+
+def count_tokens(text, model=DEFAULT_MODEL):
+    if tiktoken is None:
+        _warn_estimate()  # once per process
+        return len(ESTIMATE_RE.findall(text))
+    return len(_encoding(model).encode(text, disallowed_special=()))
+
+
+def clean(text):
+    """Text with filler words and stuttered phrases removed"""
+    text = FILLER_RE.sub(' ', text)
+    text = STUTTER_RE.sub(r'\1', text)
+    return SPACE_RE.sub(' ', text).strip(' ,')
+
+
+def sentences(text):
+    """Cleaned sentences, run-ons cut at MAX_SENTENCE_WORDS"""
+    out = []
+    for sentence in SENTENCE_RE.split(text):
+        words = clean(sentence).split()
+        for i in range(0, len(words), MAX_SENTENCE_WORDS):
+            out.append(' '.join(words[i:i + MAX_SENTENCE_WORDS]))
+    return [s for s in out if s]
+
+
+def score(sentence):
+    """How much trading content a sentence carries"""
+    tickers = sum(m.group() not in NOT_TICKERS for m in TICKER_RE.finditer(sentence))
+    tickers += sum(not m.group().isupper() for m in SPOKEN_RE.finditer(sentence))  # 'bitcoin', not 'BTC' twice
+    return (len(PRICE_RE.findall(sentence)) * PRICE_WEIGHT + tickers * TICKER_WEIGHT
+            + len(VOCABULARY_RE.findall(sentence)) * VOCABULARY_WEIGHT)
+
+
+def _join(kept, parts):
+    """Kept sentence indices, in order, joined with GAP where text was skipped"""
+    out = []
+    previous = None
+    for i in kept:
+        if previous is not None:
+            out.append(GAP if i != previous + 1 else '')
+        out.append(' ' + parts[i] if out else parts[i])
+        previous = i
+    return ''.join(out)
+
+
+def compress(transcript, budget=DEFAULT_BUDGET, model=DEFAULT_MODEL):
+    """transcript cut down to at most `budget` tokens, most price-dense sentences first"""
+    with metrics.span('compress') as span:
+        span.add(bytes=len(transcript))
+        parts = []
+        seen = set()
+        for sentence in sentences(transcript):
+            key = sentence.lower().strip('.!?')
+            if key not in seen:
+                seen.add(key)
+                parts.append(sentence)
+        whole = ' '.join(parts)
+        if count_tokens(whole, model) <= budget:
+            span.set(kept=len(parts), dropped=0)
+            return whole
+
+        # Greedy by score then position; each sentence costs its own tokens plus
+        # a gap marker, so the sum bounds the joined text
+        costs = [count_tokens(' ' + s, model) for s in parts]
+        gap = count_tokens(GAP, model)
+        order = sorted(range(len(parts)), key=lambda i: (-score(parts[i]), i))
+        kept = []
+        used = 0
+        for i in order:
+            if used + costs[i] + gap <= budget:
+                kept.append(i)
+                used += costs[i] + gap
+        kept.sort()
+        text = _join(kept, parts)
+        # Token merges across sentence boundaries can shift the count slightly
+        while kept and count_tokens(text, model) > budget:
+            kept.remove(min(kept, key=lambda i: (score(parts[i]), -i)))
+            text = _join(kept, parts)
+        span.set(kept=len(kept), dropped=len(parts) - len(kept))
+        return text
@@ -0,0 +1,128 @@
+"""Searchable view over a timed transcript.
+
+Built from vtt cues: joins the caption text once and keeps, in sorted
+arrays, each cue's character offset and start time plus the offsets of every
+price mention and ticker mention. That lets the analysis step send the LLM
+the windows where levels are actually discussed, cut on caption boundaries,
+instead of fixed character slices.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+PRICE_RE = re.compile(
+    r'\$\s?\d[\d,]*(?:\.\d+)?'             # $4.50, $102,600
+    r'|\b\d{1,3}(?:,\d{3})+(?:\.\d+)?\b'   # 93,000
+    r'|\b\d+(?:\.\d+)?\s?[kK]\b'           # 93k, 102.6 K
+    r'|\b\d{3,6}(?:\.\d+)?\b'              # 6950, 24500.5
+)
+TICKER_RE = re.compile(r'\b[A-Z]{2,5}\b')
+# Spoken names that auto-captions write out instead of the symbol
+SPOKEN_TICKERS = {
+    'bitcoin': 'BTC', 'ethereum': 'ETH', 'ether': 'ETH', 'solana': 'SOL', 'ripple': 'XRP',
+    'dogecoin': 'DOGE', 'cardano': 'ADA', 'chainlink': 'LINK', 'nvidia': 'NVDA', 'tesla': 'TSLA',
+    'apple': 'AAPL', 'microsoft': 'MSFT', 'amazon': 'AMZN', 'meta': 'META', 'google': 'GOOGL',
+    'nasdaq': 'QQQ', 'spy': 'SPY', 'qqq': 'QQQ', 'xrp': 'XRP', 'btc': 'BTC', 'eth': 'ETH', 'sol': 'SOL',
+}
+SPOKEN_RE = re.compile(r'\b(' + '|'.join(SPOKEN_TICKERS) + r')\b', re.IGNORECASE)
+# Capitalised words that look like tickers but are just speech
+NOT_TICKERS = {'I', 'OK', 'AM', 'PM', 'US', 'USA', 'CEO', 'TV', 'AI', 'THE', 'AND', 'IT', 'SO', 'GDP', 'CPI', 'FED', 'ATH'}
+
+PRICE_WEIGHT = 2
+TICKER_WEIGHT = 1
+
+
+class TranscriptIndex:
+    def __init__(self, cues, normalize=None):
+        """cues: iterable of vtt.Cue; normalize: optional per-cue text rewrite"""
+        parts = []
+        self.offsets = []  # char offset where each cue starts in self.text
+        self.times = []    # cue start, seconds
+        pos = 0
+        for cue in cues:
+            text = normalize(cue.text) if normalize else cue.text
+            if not text:
+                continue
+            self.offsets.append(pos)
+            self.times.append(cue.start)
+            parts.append(text)
+            pos += len(text) + 1
+        self.text = ' '.join(parts)
+
+        self.price_positions = [m.start() for m in PRICE_RE.finditer(self.text)]
+        self.ticker_mentions = defaultdict(list)
+        for m in TICKER_RE.finditer(self.text):
+            if m.group() not in NOT_TICKERS:
+                self.ticker_mentions[m.group()].append(m.start())
+        for m in SPOKEN_RE.finditer(self.text):
+            symbol = SPOKEN_TICKERS[m.group().lower()]
+            if m.group() != symbol:  # already counted by TICKER_RE
+                self.ticker_mentions[symbol].append(m.start())
+        for positions in self.ticker_mentions.values():
+            positions.sort()
+        self.ticker_positions = sorted(p for ps in self.ticker_mentions.values() for p in ps)
+
+    def __len__(self):
+        return len(self.text)
+
+    def offset_at(self, seconds):
+        """Char offset of the cue playing at `seconds`"""
+        i = max(bisect_right(self.times, seconds) - 1, 0)
+        return self.offsets[i] if self.offsets else 0
+
+    def time_at(self, offset):
+        """Start time (seconds) of the cue containing char `offset`"""
+        i = max(bisect_right(self.offsets, offset) - 1, 0)
+        return self.times[i] if self.times else 0.0
+
+    def score(self, start, end, ticker=None):
+        """Weighted count of price (and ticker) mentions in text[start:end]"""
+        prices = bisect_left(self.price_positions, end) - bisect_left(self.price_positions, start)
+        tickers = self.ticker_mentions.get(ticker, []) if ticker else self.ticker_positions
+        mentions = bisect_left(tickers, end) - bisect_left(tickers, start)
+        return prices * PRICE_WEIGHT + mentions * TICKER_WEIGHT
+
+    def _window_end(self, start, size):
+        """Last cue boundary within start+size (or end of text)"""
+        limit = start + size
+        if limit >= len(self.text):
+            return len(self.text)
+        i = bisect_right(self.offsets, limit) - 1
+        end = self.offsets[i] - 1 if i >= 0 else limit
+        return end if end > start else limit
+
+    def chunks(self, size):
+        """Split the whole transcript into <=size pieces on cue boundaries"""
+        out = []
+        start = 0
+        while start < len(self.text):
+            end = self._window_end(start, size)
+            out.append(self.text[start:end].strip())
+            start = end + 1
+        return [c for c in out if c]
+
+    def densest_windows(self, size, count, ticker=None):
+        """Up to `count` non-overlapping (start, end) windows with the most price talk
+
+        Windows start on cue boundaries; windows with no mentions at all are
+        skipped. Results are in transcript order.
+        """
+        candidates = []
+        for start in self.offsets:
+            end = self._window_end(start, size)
+            candidates.append((self.score(start, end, ticker), start, end))
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        chosen = []
+        for score, start, end in candidates:
+            if len(chosen) == count or score == 0:
+                break
+            if all(end <= s or start >= e for s, e in chosen):
+                chosen.append((start, end))
+        return sorted(chosen)
+
+    def densest_chunks(self, size, count, ticker=None):
+        """Text of densest_windows; falls back to the opening window if nothing scores"""
+        windows = self.densest_windows(size, count, ticker)
+        if not windows and self.text:
+            windows = [(0, self._window_end(0, size))]
+        return [self.text[start:end].strip() for start, end in windows]
@@ -0,0 +1,265 @@
+"""Subtitle downloads via yt-dlp, each job in its own scratch directory.
+
+Every fetch gets a private temp directory that is removed when the job ends,
+so any number of downloads (threads, cron runs, scripts) can run side by side
+without overwriting each other's files.
+
+Downloaded subtitles are kept in a persistent cache keyed by YouTube video ID,
+language, format and subtitle source (auto-captions, manual subtitles, extra
+yt-dlp arguments). Published videos never change, so they stay until evicted
+(least recently used first once the cache exceeds its size cap); videos that
+were still live when fetched expire after LIVE_TTL seconds.
+
+When the resident yt-dlp worker (ytdlp_worker.py) is running, downloads go
+through it instead of a fresh yt-dlp process.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+import ytdlp_worker
+from paths import CACHE_DIR
+
+# Parent for scratch dirs; defaults to the system temp dir
+SCRATCH_ROOT = os.environ.get('TRADING_AI_TMP') or None
+
+TRANSCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, 'transcripts')
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+LIVE_TTL = 15 * 60
+# yt-dlp live_status values whose subtitles may still grow
+LIVE_STATUSES = {'is_live', 'is_upcoming', 'post_live'}
+
+VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/|/live/|/shorts/|/embed/)([\w-]{11})')
+
+
+def subtitle_variant(manual_subs=False, extra_args=()):
+    """Cache key part for the subtitle source: '' for auto-captions only
+
+    Manual subtitles and extra yt-dlp arguments can yield a different file
+    for the same video and language, so they are cached separately.
+    """
+    parts = ['manual'] if manual_subs else []
+    if extra_args:
+        parts.append('x' + hashlib.sha1('\0'.join(extra_args).encode()).hexdigest()[:10])
+    return '.'.join(parts)
+
+
+def video_id(url):
+    """YouTube video ID for url, or a stable hash for anything else"""
+    match = VIDEO_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    return 'url-' + hashlib.sha1(url.encode()).hexdigest()[:16]
+
+
+class TranscriptCache:
+    """On-disk subtitle cache: <id>.<lang>.<fmt>.sub plus a .json sidecar"""
+
+    def __init__(self, root=TRANSCRIPT_CACHE_DIR, max_bytes=CACHE_MAX_BYTES, live_ttl=LIVE_TTL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self._lock = threading.Lock()
+        self._verified = set()  # (data path, sha256) already hashed by this process
+
+    def _paths(self, vid, lang, fmt, variant=''):
+        base = os.path.join(self.root, f'{vid}.{lang}.{fmt or "best"}{variant and "." + variant}')
+        return base + '.sub', base + '.json'
+
+    def get_path(self, vid, lang='en', fmt='vtt', variant=''):
+        """Path of a valid cached entry, or None on miss / expiry / corruption
+
+        Every hit checks the size recorded in the sidecar; the full sha256 is
+        checked once per entry per process, not on every hit.
+        """
+        data_path, meta_path = self._paths(vid, lang, fmt, variant)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if os.path.getsize(data_path) != meta.get('bytes'):
+                return None
+            key = (data_path, meta.get('sha256'))
+            if key not in self._verified:
+                if _file_digest(data_path) != meta.get('sha256'):
+                    return None
+                self._verified.add(key)
+        except (OSError, ValueError):
+            return None
+        if meta.get('live_status') in LIVE_STATUSES and time.time() - meta.get('fetched_at', 0) > self.live_ttl:
+            return None
+        try:
+            os.utime(data_path)  # mtime doubles as LRU timestamp
+        except OSError:
+            pass
+        return data_path
+
+    def put_file(self, vid, src, lang='en', fmt='vtt', live_status=None, variant=''):
+        """Copy a downloaded subtitle file into the cache"""
+        data_path, meta_path = self._paths(vid, lang, fmt, variant)
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as out, open(src, 'rb') as f:
+            shutil.copyfileobj(f, out)
+        meta = {
+            'video_id': vid,
+            'lang': lang,
+            'format': fmt,
+        'variant': variant,
+            'sha256': _file_digest(tmp),
+            'bytes': os.path.getsize(tmp),
+            'fetched_at': time.time(),
+            'live_status': live_status,
+        }
+        os.replace(tmp, data_path)
+        _atomic_write(meta_path, json.dumps(meta).encode())
+        self._verified.add((data_path, meta['sha256']))
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        with self._lock:
+            entries = []
+            for path in glob.glob(os.path.join(self.root, '*.sub')):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for victim in (path, path[:-len('.sub')] + '.json'):
+                    try:
+                        os.remove(victim)
+                    except OSError:
+                        pass
+                total -= size
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _atomic_write(path, raw):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(raw)
+    os.replace(tmp, path)
+
+
+transcript_cache = TranscriptCache()
+
+
+@contextmanager
+def scratch_dir(prefix='trading-ai-'):
+    """Yield a fresh private directory and delete it afterwards"""
+    path = tempfile.mkdtemp(prefix=prefix, dir=SCRATCH_ROOT)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def find_subtitle_file(workdir, lang='en', stem='sub'):
+    """Pick the subtitle file yt-dlp wrote, preferring the requested language"""
+    candidates = [p for p in sorted(glob.glob(os.path.join(workdir, stem + '.*')))
+                  if not p.endswith(('.json', '.part'))]
+    for path in candidates:
+        if os.path.basename(path).startswith(f'{stem}.{lang}.'):
+            return path
+    return candidates[0] if candidates else None
+
+
+def download_subtitles(video_url, workdir, lang='en', sub_format='vtt', timeout=120,
+                       manual_subs=False, extra_args=()):
+    """Run yt-dlp into workdir and return the subtitle path, or None"""
+    if not extra_args:
+        try:
+            result = ytdlp_worker.call('subtitles', timeout=timeout, url=video_url, lang=lang,
+                                       format=sub_format, manual=manual_subs,
+                                       dest=os.path.join(workdir, 'sub'))
+        except (ytdlp_worker.WorkerUnavailable, ytdlp_worker.WorkerError):  # fall back to the CLI
+            pass
+        else:
+            with open(os.path.join(workdir, 'live_status.txt'), 'w') as f:
+                f.write(result.get('live_status') or '')
+            return result.get('path')
+    cmd = ['yt-dlp', '--skip-download', '--write-auto-subs']
+    if manual_subs:
+        cmd.append('--write-subs')
+    cmd += ['--sub-langs', lang]
+    if sub_format:
+        cmd += ['--sub-format', sub_format]
+    cmd += list(extra_args)
+    cmd += ['--print-to-file', '%(live_status)s', os.path.join(workdir, 'live_status.txt')]
+    # own subdirectory: a worker that timed out on our side may still be writing workdir/sub.*
+    outdir = os.path.join(workdir, 'cli')
+    cmd += ['--output', os.path.join(outdir, 'sub'), video_url]
+    subprocess.run(cmd, capture_output=True, timeout=timeout)
+    return find_subtitle_file(outdir, lang)
+
+
+def read_live_status(workdir):
+    """live_status yt-dlp reported for the last download in workdir, if any"""
+    try:
+        with open(os.path.join(workdir, 'live_status.txt')) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+@contextmanager
+def open_subtitles(video_url, use_cache=True, download=True, **kwargs):
+    """Yield a text file handle on the subtitles for video_url, or None
+
+    Served from the transcript cache when possible; otherwise downloaded
+    (and cached for next time) unless download is False. The handle is only
+    valid inside the with-block.
+    """
+    vid = video_id(video_url)
+    lang = kwargs.get('lang', 'en')
+    fmt = kwargs.get('sub_format', 'vtt')
+    variant = subtitle_variant(kwargs.get('manual_subs', False), kwargs.get('extra_args', ()))
+    cached = None
+    if use_cache:
+        with metrics.span('subtitle_cache', video=vid) as span:
+            cached = transcript_cache.get_path(vid, lang, fmt, variant)
+            span.set(hit=cached is not None)
+    if cached:
+        try:
+            f = open(cached, 'r', encoding='utf-8', errors='ignore')
+        except OSError:  # evicted by another process in the meantime
+            f = None
+        if f is not None:
+            with f:
+                yield f
+            return
+    if not download:
+        yield None
+        return
+    with scratch_dir() as workdir:
+        with metrics.span('subtitles', video=vid) as span:
+            path = download_subtitles(video_url, workdir, **kwargs)
+            if path:
+                span.add(bytes=os.path.getsize(path))
+        if not path:
+            yield None
+            return
+        if use_cache:
+            transcript_cache.put_file(vid, path, lang, fmt, read_live_status(workdir), variant)
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            yield f
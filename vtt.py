@@ -0,0 +1,98 @@
+"""Incremental WebVTT parser for YouTube subtitles.
+
+Reads a subtitle stream line by line (a file handle works) and yields one
+Cue per caption line, with inline timing/styling tags removed and the
+rolling-caption repeats that auto-generated subs produce dropped. Memory use
+is bounded by the dedupe window, not by the length of the video.
+"""
+import html
+import re
+from collections import deque, namedtuple
+
+Cue = namedtuple('Cue', 'start end text')  # start/end in seconds
+
+TIMING_RE = re.compile(r'^((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3})\s+-->\s+((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3})')
+TAG_RE = re.compile(r'<[^>]*>')
+SPACE_RE = re.compile(r'\s+')
+# Auto-subs repeat each line in the next one or two cues; 16 is ample
+DEDUPE_WINDOW = 16
+
+
+def parse_timestamp(value):
+    """'01:02:03.450' / '02:03.450' -> seconds"""
+    seconds = 0.0
+    for part in value.replace(',', '.').split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def clean_text(line):
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub('', line))).strip()
+
+
+def iter_cues(lines):
+    """Yield Cue(start, end, text) for every caption line in a VTT stream
+
+    Header, STYLE/REGION and NOTE blocks and cue identifiers are skipped.
+    Nothing is deduplicated here; see iter_captions.
+    """
+    start = end = None
+    after_blank = True
+    in_note = False
+    pending = None  # first line of a block: cue text, or an identifier if timing follows
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            if pending:
+                yield Cue(start, end, pending)
+            pending = None
+            after_blank = True
+            in_note = False
+            continue
+        if in_note:
+            continue
+        match = TIMING_RE.match(line)
+        if match:
+            pending = None
+            start, end = parse_timestamp(match.group(1)), parse_timestamp(match.group(2))
+            after_blank = False
+            continue
+        if start is None:
+            continue
+        if after_blank:
+            after_blank = False
+            if line.startswith('NOTE'):
+                in_note = True
+                continue
+            pending = clean_text(line)
+            continue
+        if pending:
+            yield Cue(start, end, pending)
+            pending = None
+        text = clean_text(line)
+        if text:
+            yield Cue(start, end, text)
+    if pending:
+        yield Cue(start, end, pending)
+
+
+def iter_captions(lines, window=DEDUPE_WINDOW):
+    """iter_cues with rolling-caption duplicates removed
+
+    A line is dropped if it matches one of the last `window` emitted lines,
+    so a host repeating themselves much later in the stream is kept.
+    """
+    recent = deque()
+    seen = set()
+    for cue in iter_cues(lines):
+        if cue.text in seen:
+            continue
+        yield cue
+        recent.append(cue.text)
+        seen.add(cue.text)
+        if len(recent) > window:
+            seen.discard(recent.popleft())
+
+
+def transcript_text(cues):
+    return ' '.join(cue.text for cue in cues)
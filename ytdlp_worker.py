@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Resident yt-dlp service.
+
+Keeps yt_dlp imported and a small pool of YoutubeDL instances (with their
+HTTP connection pools) warm, and answers JSON-line requests on a local Unix
+socket. transcripts.py and channel_watch.py use it when it is running and
+fall back to spawning the yt-dlp CLI when it is not.
+
+Usage: python3 ytdlp_worker.py serve [--socket PATH] [--workers N]
+
+Requests (one JSON object per line, one reply per line):
+  {"op": "ping"}
+  {"op": "playlist", "url": ..., "max": 15, "stop_at": [ids]}
+  {"op": "subtitles", "url": ..., "lang": "en", "format": "vtt",
+   "manual": false, "dest": "/dir/sub"}
+Replies are {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+Every request may carry "timeout" (seconds); call() sends its own, so the
+worker gives up on a request when the client does, instead of finishing a
+download nobody is waiting for. Subtitles are written to <dest>...part and
+renamed when complete, so an abandoned download never leaves a file that
+looks finished.
+"""
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import time
+
+from paths import CACHE_DIR
+
+SOCKET_PATH = os.environ.get('TRADING_AI_YTDLP_SOCK') or os.path.join(CACHE_DIR, 'ytdlp.sock')
+POOL_SIZE = 4
+SOCKET_TIMEOUT = 30     # seconds per network read inside the worker (yt-dlp socket_timeout)
+REQUEST_TIMEOUT = 120   # worker-side limit for a request that doesn't send its own
+
+
+class WorkerUnavailable(Exception):
+    pass
+
+
+class WorkerError(Exception):
+    pass
+
+
+def call(op, timeout=120, socket_path=SOCKET_PATH, **params):
+    """Send one request to the worker and return its result
+
+    Raises WorkerUnavailable if no worker is listening or it hangs, crashes
+    or sends back a broken reply, WorkerError if the request failed inside
+    the worker.
+    """
+    if not os.path.exists(socket_path):
+        raise WorkerUnavailable(socket_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise WorkerUnavailable(f'{socket_path}: {e}')
+        try:
+            with sock.makefile('rw', encoding='utf-8') as f:
+                f.write(json.dumps(dict(params, op=op, timeout=timeout)) + '\n')
+                f.flush()
+                line = f.readline()
+        except OSError as e:  # includes the socket timeout of a hung worker
+            raise WorkerUnavailable(f'{socket_path}: {e}')
+    finally:
+        sock.close()
+    if not line:
+        raise WorkerUnavailable(f'{socket_path}: worker closed the connection')
+    try:
+        reply = json.loads(line)
+    except ValueError as e:  # reply cut short by a crash
+        raise WorkerUnavailable(f'{socket_path}: bad reply: {e}')
+    if not reply.get('ok'):
+        raise WorkerError(reply.get('error', 'unknown error'))
+    return reply.get('result')
+
+
+def available(socket_path=SOCKET_PATH):
+    try:
+        return call('ping', timeout=2, socket_path=socket_path) == 'pong'
+    except (WorkerUnavailable, WorkerError, OSError, ValueError):
+        return False
+
+
+# --- server side -----------------------------------------------------------
+
+def pick_subtitle_track(info, lang, sub_format, manual):
+    """(ext, url) of the track yt-dlp's --sub-langs/--sub-format would pick"""
+    sources = ([info.get('subtitles') or {}] if manual else []) + [info.get('automatic_captions') or {}]
+    for tracks in sources:
+        formats = tracks.get(lang)
+        if not formats:
+            continue
+        for wanted in (sub_format or 'best').split('/'):
+            if wanted == 'best':
+                return formats[-1]['ext'], formats[-1]['url']
+            for fmt in formats:
+                if fmt.get('ext') == wanted:
+                    return fmt['ext'], fmt['url']
+    return None
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                result = self.server.dispatch(request)
+                reply = {'ok': True, 'result': result}
+            except Exception as e:
+                reply = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+            self.wfile.write((json.dumps(reply) + '\n').encode())
+            self.wfile.flush()
+
+
+class WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path=SOCKET_PATH, pool_size=POOL_SIZE):
+        import yt_dlp  # the whole point: imported once, at start-up
+        self.pool = queue.Queue()
+        for _ in range(pool_size):
+            self.pool.put(yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'skip_download': True,
+                                            'extract_flat': 'in_playlist', 'lazy_playlist': True,
+                                            'socket_timeout': SOCKET_TIMEOUT}))
+        self.detail_pool = queue.Queue()
+        for _ in range(pool_size):
+            self.detail_pool.put(yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'skip_download': True,
+                                                   'socket_timeout': SOCKET_TIMEOUT}))
+        os.makedirs(os.path.dirname(socket_path) or '.', exist_ok=True)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, Handler)
+        os.chmod(socket_path, 0o600)
+
+    def dispatch(self, request):
+        request['deadline'] = time.monotonic() + float(request.get('timeout') or REQUEST_TIMEOUT)
+        op = request.get('op')
+        if op == 'ping':
+            return 'pong'
+        if op == 'playlist':
+            return self._with(self.pool, self.playlist, request)
+        if op == 'subtitles':
+            return self._with(self.detail_pool, self.subtitles, request)
+        raise ValueError(f'unknown op {op!r}')
+
+    @staticmethod
+    def _with(pool, fn, request):
+        try:
+            ydl = pool.get(timeout=max(request['deadline'] - time.monotonic(), 0))
+        except queue.Empty:
+            raise TimeoutError('all yt-dlp instances busy') from None
+        try:
+            return fn(ydl, request)
+        finally:
+            pool.put(ydl)
+
+    def playlist(self, ydl, request):
+        info = ydl.extract_info(request['url'], download=False, process=False)
+        stop_at = set(request.get('stop_at') or ())
+        limit = int(request.get('max', 15))
+        entries = []
+        for entry in info.get('entries') or []:
+            self._check(request)  # lazy playlist: each page is another request
+            if len(entries) >= limit or entry.get('id') in stop_at:
+                break
+            entries.append({k: entry.get(k) for k in ('id', 'title', 'upload_date', 'duration')})
+        return entries
+
+    @staticmethod
+    def _check(request):
+        if time.monotonic() > request['deadline']:
+            raise TimeoutError('request timed out in the worker')
+
+    def subtitles(self, ydl, request):
+        info = ydl.extract_info(request['url'], download=False)
+        self._check(request)
+        track = pick_subtitle_track(info, request.get('lang', 'en'), request.get('format', 'vtt'),
+                                    request.get('manual', False))
+        result = {'path': None, 'live_status': info.get('live_status')}
+        if track:
+            ext, url = track
+            path = f"{request['dest']}.{request.get('lang', 'en')}.{ext}"
+            part = path + '.part'
+            try:
+                with ydl.urlopen(url) as response, open(part, 'wb') as f:
+                    while True:
+                        self._check(request)
+                        block = response.read(1 << 16)
+                        if not block:
+                            break
+                        f.write(block)
+                os.replace(part, path)
+            except BaseException:
+                try:
+                    os.remove(part)
+                except OSError:
+                    pass
+                raise
+            result['path'] = path
+        return result
+
+
+def serve(socket_path=SOCKET_PATH, pool_size=POOL_SIZE):
+    server = WorkerServer(socket_path, pool_size)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # still remove the socket
+    print(f'yt-dlp worker listening on {socket_path}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args or args[0] != 'serve':
+        print(__doc__.split('\n\n')[2])
+        sys.exit(1)
+    path, workers = SOCKET_PATH, POOL_SIZE
+    if '--socket' in args:
+        path = args[args.index('--socket') + 1]
+    if '--workers' in args:
+        workers = int(args[args.index('--workers') + 1])
+    serve(path, workers)